@@ -34,8 +34,9 @@ generate_schematic("voltage_divider.kicad_sch", title="Voltage Divider")
 print("\nGenerating netlist...")
 generate_netlist("voltage_divider.net")
 
+circuit = get_circuit()
 print("\nCircuit summary:")
-print(f"  Parts: {len(get_circuit().parts)}")
-print(f"  Nets: {len(get_circuit().nets)}")
-for part in get_circuit().parts:
+print(f"  Parts: {len(circuit.parts)}")
+print(f"  Nets: {len(circuit.nets)}")
+for part in circuit.parts:
     print(f"    {part.ref}: {part.name} = {part.value}")
@@ -29,7 +29,7 @@ from .api import (
     Part, Net, Pin, PinType, Symbol,
     TEMPLATE, NETLIST,
     ERC, generate_netlist, generate_schematic,
-    set_default_tool, get_circuit, reset_circuit,
+    set_default_tool, get_circuit, reset_circuit, bulk_add,
     KICAD, KICAD8, KICAD9,
 )
 from .models.bus import Bus, PinGroup
@@ -44,7 +44,7 @@ from .sexpr import parse, parse_file, serialize, serialize_to_file
 from .io import (
     read_symbol_library, write_symbol_library,
     find_kicad_symbols, SymbolLibrary, SchematicWriter,
-    add_lib_path, lib_search_paths, clear_lib_paths,
+    add_lib_path, lib_search_paths, clear_lib_paths, enable_lib_cache,
     auto_discover_libs, search_parts, list_libraries,
 )
 
@@ -72,14 +72,14 @@ __all__ = [
     "subcircuit", "Interface",
     "TEMPLATE", "NETLIST",
     "ERC", "generate_netlist", "generate_schematic",
-    "set_default_tool", "get_circuit", "reset_circuit",
+    "set_default_tool", "get_circuit", "reset_circuit", "bulk_add",
     "KICAD", "KICAD8", "KICAD9",
     # S-expression
     "parse", "parse_file", "serialize", "serialize_to_file",
     # I/O
     "read_symbol_library", "write_symbol_library",
     "find_kicad_symbols", "SymbolLibrary", "SchematicWriter",
-    "add_lib_path", "lib_search_paths", "clear_lib_paths",
+    "add_lib_path", "lib_search_paths", "clear_lib_paths", "enable_lib_cache",
     "auto_discover_libs", "search_parts", "list_libraries",
     # BOM
     "generate_bom", "register_exporter", "BOMExporter", "reduce_bom", "list_exporters",
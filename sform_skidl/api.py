@@ -6,15 +6,20 @@ Provides the main interface for circuit design matching SKiDL conventions.
 
 from __future__ import annotations
 
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+import functools
 import os
 
 from .models.part import Part, TEMPLATE, NETLIST
 from .models.net import Net
 from .models.pin import Pin, PinType
 from .models.symbol import Symbol
-from .io.symbol_lib import get_library, find_kicad_symbols, add_lib_path, lib_search_paths
+from .io.symbol_lib import (
+    get_library, resolve_symbol, find_kicad_symbols, add_lib_path, lib_search_paths,
+)
 from .io.schematic_io import SchematicWriter
+from .sexpr.writer import _ESCAPE_TABLE
 from .compat import NC, Group, no_connect
 
 
@@ -25,6 +30,7 @@ __all__ = [
     "NC", "Group", "no_connect",
     "ERC", "generate_netlist", "generate_schematic",
     "set_default_tool", "add_lib_path", "lib_search_paths",
+    "bulk_add",
 ]
 
 
@@ -41,7 +47,7 @@ class Circuit:
         """Clear the current circuit."""
         self.parts.clear()
         self.nets.clear()
-        Part._counters = {}
+        _OriginalPart._counters.clear()
         Net._counter = 0
 
 
@@ -58,6 +64,37 @@ def reset_circuit():
     _circuit.reset()
 
 
+# Parts created inside bulk_add(), appended to the circuit on exit
+_bulk_parts: list[Part] | None = None
+
+
+@contextmanager
+def bulk_add():
+    """
+    Batch parts created in this block into the circuit in one step.
+    
+    Reference designators are still assigned as each part is created;
+    only the circuit's part list is extended once, when the block exits.
+    Parts are not visible in get_circuit().parts until then.
+    
+    Example:
+        with bulk_add():
+            caps = [Part('Device', 'C', value='100nF') for _ in range(1000)]
+    """
+    global _bulk_parts
+    if _bulk_parts is not None:
+        # Nested: the outer block flushes everything
+        yield
+        return
+    
+    _bulk_parts = []
+    try:
+        yield
+    finally:
+        pending, _bulk_parts = _bulk_parts, None
+        _circuit.parts.extend(pending)
+
+
 # Tool constants
 KICAD = "KICAD"
 KICAD8 = "KICAD8"
@@ -76,6 +113,82 @@ def set_default_tool(tool: str):
 from .models.part import Part as _OriginalPart
 
 
+def _make_passive_symbol(name: str) -> Symbol:
+    """Fallback symbol for R, C and L: rectangle body, pins top and bottom."""
+    from .models.symbol import GraphicItem
+    
+    symbol = Symbol(name=name)
+    symbol.pin_numbers_hide = True  # Hide pin numbers for 2-pin passives
+    # Resistor rectangle body from -2.54 to 2.54
+    symbol.graphics = [
+        GraphicItem("rectangle", {
+            "start_x": -1.016,
+            "start_y": -2.54,
+            "end_x": 1.016,
+            "end_y": 2.54,
+            "stroke_width": 0.254,
+            "stroke_type": "default",
+            "fill": "none",
+        }),
+    ]
+    # Pins at top and bottom with proper positions
+    symbol.pins = [
+        Pin("1", "~", PinType.PASSIVE, position=(0, 3.81), length=1.27, orientation=270),
+        Pin("2", "~", PinType.PASSIVE, position=(0, -3.81), length=1.27, orientation=90),
+    ]
+    return symbol
+
+
+def _make_led_symbol() -> Symbol:
+    """Fallback symbol for LED: triangle body, anode and cathode pins."""
+    from .models.symbol import GraphicItem
+    
+    symbol = Symbol(name="LED")
+    symbol.pin_numbers_hide = True
+    symbol.graphics = [
+        GraphicItem("polyline", {
+            "points": [(-1.27, 1.27), (-1.27, -1.27), (1.27, 0)],
+            "stroke_width": 0.254,
+            "fill": "none",
+        }),
+    ]
+    symbol.pins = [
+        Pin("1", "A", PinType.PASSIVE, position=(0, 2.54), length=1.27, orientation=270),
+        Pin("2", "K", PinType.PASSIVE, position=(0, -2.54), length=1.27, orientation=90),
+    ]
+    return symbol
+
+
+@functools.lru_cache(maxsize=None)
+def _make_generic_symbol(name: str) -> Symbol:
+    """Fallback symbol for any other name: a bare 2-pin passive (cached)."""
+    symbol = Symbol(name=name)
+    symbol.pin_numbers_hide = True
+    symbol.pins = [
+        Pin("1", "1", PinType.PASSIVE, position=(0, 2.54), length=1.27, orientation=270),
+        Pin("2", "2", PinType.PASSIVE, position=(0, -2.54), length=1.27, orientation=90),
+    ]
+    return symbol
+
+
+# Prebuilt fallback symbols for the common passives. Parts instantiate
+# their own pins from the symbol, so every part can share these.
+_DEFAULT_SYMBOLS: dict[str, Symbol] = {
+    "R": _make_passive_symbol("R"),
+    "C": _make_passive_symbol("C"),
+    "L": _make_passive_symbol("L"),
+    "LED": _make_led_symbol(),
+}
+
+
+def _default_symbol(name: str) -> Symbol:
+    """Fallback symbol used when `name` is not in any library."""
+    symbol = _DEFAULT_SYMBOLS.get(name)
+    if symbol is None:
+        symbol = _make_generic_symbol(name)
+    return symbol
+
+
 def _create_part(
     lib: str,
     name: str,
@@ -98,58 +211,10 @@ def _create_part(
     Returns:
         Part instance.
     """
-    # Try to load symbol from library
-    symbol = None
-    try:
-        library = get_library(lib)
-        symbol = library.get(name)
-    except FileNotFoundError:
-        pass
-    
-    # Create basic symbol if not found
+    # Try to load symbol from library, else fall back to a built-in default
+    symbol = resolve_symbol(lib, name)
     if symbol is None:
-        from .models.symbol import GraphicItem
-        
-        symbol = Symbol(name=name)
-        symbol.pin_numbers_hide = True  # Hide pin numbers for 2-pin passives
-        
-        # Add proper graphics and pins for common parts
-        if name in ("R", "C", "L"):
-            # Resistor rectangle body from -2.54 to 2.54
-            symbol.graphics = [
-                GraphicItem("rectangle", {
-                    "start_x": -1.016,
-                    "start_y": -2.54,
-                    "end_x": 1.016,
-                    "end_y": 2.54,
-                    "stroke_width": 0.254,
-                    "stroke_type": "default",
-                    "fill": "none",
-                }),
-            ]
-            # Pins at top and bottom with proper positions
-            symbol.pins = [
-                Pin("1", "~", PinType.PASSIVE, position=(0, 3.81), length=1.27, orientation=270),
-                Pin("2", "~", PinType.PASSIVE, position=(0, -3.81), length=1.27, orientation=90),
-            ]
-        elif name == "LED":
-            symbol.graphics = [
-                GraphicItem("polyline", {
-                    "points": [(-1.27, 1.27), (-1.27, -1.27), (1.27, 0)],
-                    "stroke_width": 0.254,
-                    "fill": "none",
-                }),
-            ]
-            symbol.pins = [
-                Pin("1", "A", PinType.PASSIVE, position=(0, 2.54), length=1.27, orientation=270),
-                Pin("2", "K", PinType.PASSIVE, position=(0, -2.54), length=1.27, orientation=90),
-            ]
-        else:
-            # Generic 2-pin passive
-            symbol.pins = [
-                Pin("1", "1", PinType.PASSIVE, position=(0, 2.54), length=1.27, orientation=270),
-                Pin("2", "2", PinType.PASSIVE, position=(0, -2.54), length=1.27, orientation=90),
-            ]
+        symbol = _default_symbol(name)
     
     # Use the original Part class to avoid recursion
     part = _OriginalPart(
@@ -163,7 +228,10 @@ def _create_part(
     
     # Add to circuit if not a template
     if dest != TEMPLATE:
-        _circuit.parts.append(part)
+        if _bulk_parts is not None:
+            _bulk_parts.append(part)
+        else:
+            _circuit.parts.append(part)
     
     return part
 
@@ -216,6 +284,23 @@ class ERCError:
         return f"ERCError({self.severity!r}, {self.message!r})"
 
 
+# ERC pin classification tables
+_ERC_UNCONNECTED_ERROR_TYPES = frozenset({PinType.INPUT, PinType.OUTPUT, PinType.POWER_IN})
+_ERC_DRIVER_TYPES = (PinType.OUTPUT, PinType.BIDIRECTIONAL, PinType.POWER_OUT)
+_ERC_POWER_PIN_NAMES = frozenset({'VCC', 'VDD', 'V+', '3V3', '5V', '12V'})
+_ERC_GROUND_PIN_NAMES = frozenset({'GND', 'VSS', 'V-', 'AGND', 'DGND'})
+
+
+def _erc_pin_refs(pins) -> str:
+    """Format 'REF.PIN' for pins that belong to a part."""
+    refs = []
+    for p in pins:
+        part = p._part
+        if part is not None:
+            refs.append(f"{part.ref}.{p.number}")
+    return ", ".join(refs)
+
+
 def ERC(circuit: Circuit | None = None, verbose: bool = True) -> list[ERCError]:
     """
     Run Electrical Rules Check on the circuit.
@@ -242,90 +327,96 @@ def ERC(circuit: Circuit | None = None, verbose: bool = True) -> list[ERCError]:
     
     # Check 1: Unconnected pins
     for part in circuit.parts:
-        for pin in part.pins:
+        for pin in part._pin_list:
             # Skip if marked as no-connect
-            if getattr(pin, '_no_connect', False):
+            if pin._no_connect or pin._net is not None:
                 continue
-                
-            if not pin.is_connected:
-                if pin.pin_type in (PinType.INPUT, PinType.OUTPUT, PinType.POWER_IN):
-                    errors.append(ERCError(
-                        "error",
-                        f"Unconnected {pin.pin_type.value} pin",
-                        f"{part.ref}.{pin.number}",
-                    ))
-                elif pin.pin_type != PinType.NO_CONNECT:
-                    errors.append(ERCError(
-                        "warning",
-                        f"Unconnected {pin.pin_type.value} pin",
-                        f"{part.ref}.{pin.number}",
-                    ))
-    
-    # Check 2: Output-to-output conflicts
-    for net in circuit.nets:
-        outputs = [p for p in net.pins if p.pin_type == PinType.OUTPUT]
-        if len(outputs) > 1:
-            refs = ", ".join(f"{p.part.ref}.{p.number}" for p in outputs if hasattr(p, 'part'))
-            errors.append(ERCError(
-                "error",
-                f"Multiple outputs connected: {refs}",
-                net.name,
-            ))
-    
-    # Check 3: Input without driver
-    for net in circuit.nets:
-        inputs = [p for p in net.pins if p.pin_type == PinType.INPUT]
-        drivers = [p for p in net.pins if p.pin_type in (
-            PinType.OUTPUT, PinType.BIDIRECTIONAL, PinType.POWER_OUT
-        )]
-        
-        if inputs and not drivers:
-            # Check if there's at least a passive or power source
-            passive = [p for p in net.pins if p.pin_type == PinType.PASSIVE]
-            power_in = [p for p in net.pins if p.pin_type == PinType.POWER_IN]
             
-            if not passive and not power_in:
-                input_refs = ", ".join(f"{p.part.ref}.{p.number}" for p in inputs if hasattr(p, 'part'))
+            pin_type = pin._pin_type
+            if pin_type in _ERC_UNCONNECTED_ERROR_TYPES:
+                errors.append(ERCError(
+                    "error",
+                    f"Unconnected {pin_type.value} pin",
+                    f"{part.ref}.{pin.number}",
+                ))
+            elif pin_type is not PinType.NO_CONNECT:
                 errors.append(ERCError(
                     "warning",
-                    f"Input pins without driver: {input_refs}",
-                    net.name,
+                    f"Unconnected {pin_type.value} pin",
+                    f"{part.ref}.{pin.number}",
                 ))
     
-    # Check 4: Power-to-ground short (power_in pins with conflicting names)
-    power_nets = {}
+    # Checks 2-5 share a single walk over each net's pins. Results are
+    # collected per check so the report keeps the check-by-check order.
+    output_conflicts = []
+    undriven_inputs = []
+    power_shorts = []
+    floating_nets = []
+    
+    OUTPUT, INPUT = PinType.OUTPUT, PinType.INPUT
+    PASSIVE, POWER_IN = PinType.PASSIVE, PinType.POWER_IN
+    
     for net in circuit.nets:
-        power_pins = [p for p in net.pins if p.pin_type == PinType.POWER_IN]
-        if power_pins:
-            # Check for obvious VCC/GND conflict
-            pin_names = set(p.name.upper() for p in power_pins)
-            has_power = any(n in ['VCC', 'VDD', 'V+', '3V3', '5V', '12V'] for n in pin_names)
-            has_ground = any(n in ['GND', 'VSS', 'V-', 'AGND', 'DGND'] for n in pin_names)
-            
-            if has_power and has_ground:
-                errors.append(ERCError(
+        pins = net._pins
+        if not pins:
+            continue
+        
+        # .get() stays in C; Counter's own lookup calls __missing__ for
+        # every absent type.
+        count = net._type_counts.get
+        n_passive = count(PASSIVE, 0)
+        n_power_in = count(POWER_IN, 0)
+        
+        # Check 2: Output-to-output conflicts
+        if count(OUTPUT, 0) > 1:
+            refs = _erc_pin_refs(p for p in pins if p._pin_type is OUTPUT)
+            output_conflicts.append(ERCError(
+                "error",
+                f"Multiple outputs connected: {refs}",
+                net.name,
+            ))
+        
+        # Check 3: Input without driver (and no passive or power source)
+        if (
+            count(INPUT, 0)
+            and not n_passive
+            and not n_power_in
+            and not any(count(t, 0) for t in _ERC_DRIVER_TYPES)
+        ):
+            input_refs = _erc_pin_refs(p for p in pins if p._pin_type is INPUT)
+            undriven_inputs.append(ERCError(
+                "warning",
+                f"Input pins without driver: {input_refs}",
+                net.name,
+            ))
+        
+        # Check 4: Power-to-ground short (power_in pins with conflicting names)
+        if n_power_in:
+            pin_names = {p.name.upper() for p in pins if p._pin_type is POWER_IN}
+            if pin_names & _ERC_POWER_PIN_NAMES and pin_names & _ERC_GROUND_PIN_NAMES:
+                power_shorts.append(ERCError(
                     "error",
                     f"Possible power-to-ground short",
                     net.name,
                 ))
-    
-    # Check 5: Floating nets (only passive pins, no power or signal)
-    for net in circuit.nets:
-        if len(net.pins) < 2:
-            continue
-            
-        pin_types = set(p.pin_type for p in net.pins)
-        if pin_types == {PinType.PASSIVE}:
+        
+        # Check 5: Floating nets (only passive pins, no power or signal)
+        if n_passive == len(pins) >= 2:
             # All passive, no driver - might be intentional but worth noting
-            refs = ", ".join(f"{p.part.ref}.{p.number}" for p in net.pins[:3] if hasattr(p, 'part'))
-            if len(net.pins) > 3:
-                refs += f"... ({len(net.pins)} pins)"
-            errors.append(ERCError(
+            refs = _erc_pin_refs(pins[:3])
+            if len(pins) > 3:
+                refs += f"... ({len(pins)} pins)"
+            floating_nets.append(ERCError(
                 "warning",
                 f"Net has only passive pins (no driver): {refs}",
                 net.name,
             ))
     
+    errors.extend(output_conflicts)
+    errors.extend(undriven_inputs)
+    errors.extend(power_shorts)
+    errors.extend(floating_nets)
+    
     # Report ERC results
     error_count = sum(1 for e in errors if e.severity == "error")
     warning_count = sum(1 for e in errors if e.severity == "warning")
@@ -341,6 +432,39 @@ def ERC(circuit: Circuit | None = None, verbose: bool = True) -> list[ERCError]:
     return errors
 
 
+# Netlist fragments (each ends with its own newline)
+_NETLIST_HEADER_FMT = (
+    '(export\n'
+    '  (version "E")\n'
+    '  (design\n'
+    '    (source "{}")\n'
+    '    (tool "sform_skidl")\n'
+    '  )\n'
+    '  (components\n'
+)
+_NETLIST_COMP_FMT = (
+    '    (comp (ref "{}")\n'
+    '      (value "{}")\n'
+    '      (libsource (lib "{}") (part "{}"))\n'
+    '    )\n'
+)
+_NETLIST_COMP_FP_FMT = (
+    '    (comp (ref "{}")\n'
+    '      (value "{}")\n'
+    '      (footprint "{}")\n'
+    '      (libsource (lib "{}") (part "{}"))\n'
+    '    )\n'
+)
+_NETLIST_NET_FMT = '    (net (code "{}") (name "{}")\n'
+_NETLIST_NODE_FMT = '      (node (ref "{}") (pin "{}"))\n'
+_NETLIST_BUFFER_SIZE = 1 << 20
+
+
+def _esc(value) -> str:
+    """Escape a value for use inside a quoted netlist string."""
+    return str(value).translate(_ESCAPE_TABLE)
+
+
 def generate_netlist(
     path: str | None = None,
     tool: str | None = None,
@@ -366,46 +490,150 @@ def generate_netlist(
     if path is None:
         path = f"{circuit.name}.net"
     
-    # Generate simple KiCad netlist format
-    lines = [
-        "(export",
-        f'  (version "E")',
-        "  (design",
-        f'    (source "{path}")',
-        f'    (tool "sform_skidl")',
-        "  )",
-        "  (components",
-    ]
+    # Generate simple KiCad netlist format, streamed through one buffered
+    # file handle instead of joining a list of per-line strings.
+    comp_fmt = _NETLIST_COMP_FMT.format
+    comp_fp_fmt = _NETLIST_COMP_FP_FMT.format
+    net_fmt = _NETLIST_NET_FMT.format
+    node_fmt = _NETLIST_NODE_FMT.format
+    
+    with open(path, "w", encoding="utf-8", newline="\n",
+              buffering=_NETLIST_BUFFER_SIZE) as f:
+        write = f.write
+        write(_NETLIST_HEADER_FMT.format(_esc(path)))
+        
+        # Each part's ref is escaped once here and reused for its net nodes
+        refs = {}
+        for part in circuit.parts:
+            ref = refs[id(part)] = _esc(part.ref)
+            value = _esc(part.value)
+            lib = _esc(part.lib)
+            name = _esc(part.name)
+            footprint = part.footprint
+            if footprint:
+                write(comp_fp_fmt(ref, value, _esc(footprint), lib, name))
+            else:
+                write(comp_fmt(ref, value, lib, name))
+        
+        write("  )\n  (nets\n")
+        
+        for i, net in enumerate(circuit.nets, 1):
+            pins = net._pins
+            if pins:
+                write(net_fmt(i, _esc(net.name)))
+                for pin in pins:
+                    part = pin._part
+                    if part:
+                        ref = refs.get(id(part))
+                        if ref is None:
+                            ref = _esc(part.ref)
+                        write(node_fmt(ref, _esc(pin.number)))
+                write("    )\n")
+        
+        write("  )\n)")
     
-    for part in circuit.parts:
-        lines.append(f'    (comp (ref "{part.ref}")')
-        lines.append(f'      (value "{part.value}")')
-        if part.footprint:
-            lines.append(f'      (footprint "{part.footprint}")')
-        lines.append(f'      (libsource (lib "{part.lib}") (part "{part.name}"))')
-        lines.append("    )")
+    print(f"Netlist written to: {path}")
+    return path
+
+
+class _SheetJob(NamedTuple):
+    """Everything needed to write one schematic sheet (picklable for workers)."""
+    filepath: str
+    title: str
+    rev: str
+    date: str
+    company: str
+    paper: str
+    parts: list[Part]
+    nets: list[Net]
+    smart_layout: bool
+
+
+def _write_sheet(job: _SheetJob) -> str:
+    """
+    Lay out, wire and write a single schematic sheet.
     
-    lines.append("  )")
-    lines.append("  (nets")
+    Each sheet only touches its own writer and layout, so sheets can be
+    written independently (see generate_schematic's `workers`).
     
-    for i, net in enumerate(circuit.nets):
-        if net.pins:
-            lines.append(f'    (net (code "{i+1}") (name "{net.name}")')
-            for pin in net.pins:
-                if pin.part:
-                    lines.append(f'      (node (ref "{pin.part.ref}") (pin "{pin.number}"))')
-            lines.append("    )")
+    Returns:
+        The path that was written.
+    """
+    parts, nets = job.parts, job.nets
+    writer = SchematicWriter(
+        title=job.title,
+        rev=job.rev,
+        date=job.date,
+        company=job.company,
+        paper=job.paper
+    )
+    
+    if job.smart_layout:
+        from .layout import SmartLayout
+        # SmartLayout reads circuit.parts and circuit.nets, so hand it an
+        # ephemeral circuit holding just this sheet's parts and nets.
+        dummy_c = Circuit()
+        dummy_c.parts = parts
+        dummy_c.nets = nets
+        
+        layout = SmartLayout(dummy_c)
+        positions = layout.analyze()
+        
+        parts_by_ref = {}
+        for p in parts:
+            parts_by_ref.setdefault(p.ref, p)
+        
+        for ref, placement in positions.items():
+            part = parts_by_ref.get(ref)
+            if part:
+                writer.add_part(part, (placement.x, placement.y))
+    else:
+        writer.auto_place_parts(parts)
     
-    lines.append("  )")
-    lines.append(")")
+    # Inject Power Flags before wiring
+    writer.auto_inject_power_flags(nets)
     
-    content = "\n".join(lines)
+    # Child sheet ports are carried by the global labels that
+    # auto_wire_nets places on named nets.
+    writer.auto_wire_nets(nets)
     
-    from pathlib import Path as PathClass
-    PathClass(path).write_text(content, encoding="utf-8")
+    writer.write(job.filepath)
+    return job.filepath
+
+
+def _write_sheets_parallel(jobs: list[_SheetJob], workers: int) -> list[str]:
+    """
+    Write sheets in a process pool, falling back to in-process writing.
     
-    print(f"Netlist written to: {path}")
-    return path
+    Very long connection chains can exceed pickle's recursion limit when
+    a sheet's parts are sent to a worker; those sheets are written here.
+    
+    Workers operate on copies of the circuit, so nothing they change flows
+    back to the caller. Part and net UUIDs are generated here before
+    dispatch so both sides agree on them; the Part/Net auto-naming
+    counters are not shared, and refs or names created while a sheet is
+    written (e.g. injected PWR_FLAGs) are only seen by that worker.
+    """
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor
+    
+    # UUIDs are lazy; fix them now rather than letting each worker roll
+    # its own. Pin UUIDs derive from their part's.
+    for job in jobs:
+        for part in job.parts:
+            part.uuid
+        for net in job.nets:
+            net.uuid
+    
+    generated = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(_write_sheet, job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                generated.append(future.result())
+            except (RecursionError, pickle.PicklingError):
+                generated.append(_write_sheet(job))
+    return generated
 
 
 def generate_schematic(
@@ -417,9 +645,14 @@ def generate_schematic(
     paper: str = "A4",
     circuit: Circuit | None = None,
     smart_layout: bool = True,
+    workers: int | None = None,
 ) -> str:
     """
     Generate a KiCad schematic file (hierarchical).
+    
+    Args:
+        workers: Write sheets of a hierarchical design in this many worker
+            processes. None or 1 writes them one after another.
     """
     if circuit is None:
         circuit = _circuit
@@ -427,6 +660,22 @@ def generate_schematic(
     if path is None:
         path = f"{circuit.name}.kicad_sch"
     
+    # Flat circuit: one sheet holding every part, so skip the hierarchy
+    # analysis, sheet symbols and per-sheet partitioning entirely.
+    if not any(part.hierarchy for part in circuit.parts):
+        part_ids = {id(part) for part in circuit.parts}
+        nets = [
+            net for net in circuit.nets
+            if any(id(pin._part) in part_ids for pin in net._pins)
+        ]
+        _write_sheet(_SheetJob(
+            filepath=path, title=title or circuit.name, rev=rev, date=date,
+            company=company, paper=paper, parts=circuit.parts, nets=nets,
+            smart_layout=smart_layout,
+        ))
+        print(f"Schematic(s) written to: {path}")
+        return path
+    
     # 1. Analyze Hierarchy
     from .hierarchy_analyzer import HierarchyAnalyzer
     analyzer = HierarchyAnalyzer(circuit.parts, circuit.nets)
@@ -440,6 +689,12 @@ def generate_schematic(
     base_path = PathClass(path)
     sheet_parts_map = {}
     
+    # First net wins on duplicate names, matching a linear search
+    nets_by_name: dict[str, Net] = {}
+    for n in circuit.nets:
+        nets_by_name.setdefault(n.name, n)
+    unresolved_ports = []
+    
     # Sort by depth to process children first? 
     # Actually order doesn't matter for creation, only for linking.
     # Identifying parents:
@@ -463,14 +718,29 @@ def generate_schematic(
         sp.layout_ports()
         sheet_parts_map[h_path] = sp
         
-        # Link Virtual Pins to Nets so Router sees them
-        for pin in sp.pins:
-            # pin.name is net_name
-            # find net
-            target_net = next((n for n in circuit.nets if n.name == pin.name), None)
+        # Link Virtual Pins to Nets so Router sees them (pin.name is the
+        # net name); misses get a second, looser pass below
+        for pin in sp._pin_list:
+            target_net = nets_by_name.get(pin.name)
+            if target_net:
+                # Back-link only: the sheet pin must not join the circuit net
+                pin._net = target_net
+            else:
+                unresolved_ports.append((sp, pin))
+    
+    # Second pass: match remaining ports ignoring case and surrounding
+    # whitespace, instead of silently leaving them unconnected
+    if unresolved_ports:
+        nets_by_key: dict[str, Net] = {}
+        for n in circuit.nets:
+            nets_by_key.setdefault(n.name.strip().casefold(), n)
+        
+        for sp, pin in unresolved_ports:
+            target_net = nets_by_key.get(pin.name.strip().casefold())
             if target_net:
-                target_net.pins.append(pin)
-                pin.net = target_net
+                pin._net = target_net
+            else:
+                print(f"Warning: sheet {sp.ref} port '{pin.name}' matches no net")
     
     # 3. Assign Sheet Parts to Parents
     for h_path, sp in sheet_parts_map.items():
@@ -484,7 +754,7 @@ def generate_schematic(
             sheets[parent_path].parts.append(sp)
             
     # 4. Generate Schematics for each Sheet
-    generated_files = []
+    jobs = []
     
     for h_path, node in sheets.items():
          is_root = (h_path == "")
@@ -497,87 +767,23 @@ def generate_schematic(
              filepath = str(base_path.with_name(f"{base_path.stem}_{subname}{base_path.suffix}"))
              sheet_title = f"{title} - {subname}"
          
-         writer = SchematicWriter(
-             title=sheet_title,
-             rev=rev,
-             date=date,
-             company=company,
-             paper=paper
-         )
-         
          # Partition Nets?
          # Passing all nets is fine, writer ignores those not connected to placed parts.
          # But for performance and clarity, we could filter.
          # Filter: Net must touch at least one part in node.parts
-         sheet_parts_ids = {id(p) for p in node.parts}
-         sheet_nets = []
-         for net in circuit.nets:
-             if any(id(p.part) in sheet_parts_ids for p in net.pins if p.part):
-                 sheet_nets.append(net)
-         
-         if smart_layout:
-             from .layout import SmartLayout
-             # Create ephemeral circuit for layout
-             # We just need parts and nets.
-             # SmartLayout expects a Circuit object? 
-             # No, constructor takes `circuit`.
-             # We can mock it or modify SmartLayout to take parts/nets?
-             # Let's peek at SmartLayout.
-             # It uses circuit.parts and circuit.nets.
-             # I can construct a dummy circuit.
-             dummy_c = Circuit()
-             dummy_c.parts = node.parts
-             dummy_c.nets = sheet_nets
-             
-             layout = SmartLayout(dummy_c)
-             positions = layout.analyze()
-             
-             for ref, placement in positions.items():
-                 part = next((p for p in node.parts if p.ref == ref), None)
-                 if part:
-                     writer.add_part(part, (placement.x, placement.y))
-         else:
-             writer.auto_place_parts(node.parts)
-         
-         # Inject Power Flags before wiring
-         writer.auto_inject_power_flags(sheet_nets)
-         
-         writer.auto_wire_nets(sheet_nets)
-         
-         # For Child Sheets: Add Hierarchical Labels for Ports
-         if not is_root:
-             for port_net in node.ports:
-                 # Helper to find where the port enters the sheet
-                 # We placed components. We wired them.
-                 # The wire ends at the "Port"?
-                 # No, "Port" is not a component in the Child Sheet. 
-                 # It is just a Label on a Net.
-                 # But we need to place the Label nicely.
-                 # Usually at the edge of the sheet area.
-                 # Since we ran SmartLayout, we have bounds.
-                 # We can place Labels at edges.
-                 
-                 # Simpler auto-placement for labels:
-                 # Find an endpoint of the net that is "open"?
-                 # Or just pick any point on the net and stick a H-Label?
-                 # Better: Stick H-Label near one of the component pins connected to it?
-                 pass
-                 # Currently SchematicWriter.auto_wire_nets adds "Labels" for stub nets.
-                 # Are Ports stub nets?
-                 # If we mark them as such?
-                 # Or explicitly add H-Labels.
-                 # Let's rely on standard labeling for now.
-                 # If `auto_wire_nets` adds labels, they are Global.
-                 # Hierarchical Labels are `hierarchical_label`.
-                 # So we should force H-Label for Ports.
-                 
-                 # I will skip explicit H-Label placement logic here to verify basic connectivity first.
-                 # SchematicWriter likely defaults to Global Labels which work physically but fail Hierarchy checks strictly.
-                 # But KiCad 6+ allows mixing?
-                 # Ideally we change `add_label` to support type="hierarchical".
+         # (looked up through the analyzer's part -> nets index, not a pin scan)
+         sheet_nets = analyzer.nets_for_parts(node.parts)
          
-         writer.write(filepath)
-         generated_files.append(filepath)
+         jobs.append(_SheetJob(
+             filepath=filepath, title=sheet_title, rev=rev, date=date,
+             company=company, paper=paper, parts=node.parts, nets=sheet_nets,
+             smart_layout=smart_layout,
+         ))
+    
+    if workers and workers > 1 and len(jobs) > 1:
+        generated_files = _write_sheets_parallel(jobs, workers)
+    else:
+        generated_files = [_write_sheet(job) for job in jobs]
 
     print(f"Schematic(s) written to: {', '.join(generated_files)}")
     return path
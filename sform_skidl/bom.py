@@ -6,18 +6,42 @@ Provides flexible export to various PCB vendor formats.
 
 from __future__ import annotations
 
-import csv
+import functools
+import re
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:
     from .models.part import Part
 
 
-@dataclass
+_CSV_BUFFER_SIZE = 1 << 20
+
+# Characters that make csv.writer (QUOTE_MINIMAL) quote a field
+_CSV_QUOTE_RE = re.compile(r'[,"\r\n]')
+
+
+def _csv_field(value) -> str:
+    """Format one field exactly as csv.writer's default dialect would."""
+    if value is None:
+        return ""
+    s = value if isinstance(value, str) else str(value)
+    if _CSV_QUOTE_RE.search(s):
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+
+def _csv_line(row: list) -> str:
+    """Format a row as one CSV line; most fields need no quoting."""
+    if len(row) == 1 and not _csv_field(row[0]):
+        return '""\r\n'  # csv.writer quotes a lone empty field
+    return ",".join(map(_csv_field, row)) + "\r\n"
+
+
+@dataclass(slots=True)
 class BOMItem:
     """A single line in the BOM."""
     designators: list[str] = field(default_factory=list)
@@ -30,6 +54,11 @@ class BOMItem:
     
     def __post_init__(self):
         self.quantity = len(self.designators)
+    
+    @property
+    def designator_str(self) -> str:
+        """Sorted, comma-joined designators (e.g. "R1,R2")."""
+        return ",".join(sorted(self.designators))
 
 
 class BOMExporter(ABC):
@@ -57,14 +86,15 @@ class BOMExporter(ABC):
         """Format a BOM item as a row for this vendor."""
         pass
     
-    def export(self, items: list[BOMItem], path: str | Path):
-        """Export BOM items to a CSV file."""
+    def export(self, items: Iterable[BOMItem], path: str | Path):
+        """Export BOM items to a CSV file, consuming `items` once in order."""
         path = Path(path)
-        with path.open('w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(self.get_columns())
+        # Large buffer so rows are flushed in few big writes
+        with path.open('w', newline='', buffering=_CSV_BUFFER_SIZE) as f:
+            write = f.write
+            write(_csv_line(self.get_columns()))
             for item in items:
-                writer.writerow(self.format_row(item))
+                write(_csv_line(self.format_row(item)))
 
 
 class GenericExporter(BOMExporter):
@@ -76,7 +106,7 @@ class GenericExporter(BOMExporter):
     
     def format_row(self, item: BOMItem) -> list[str]:
         return [
-            ",".join(sorted(item.designators)),
+            item.designator_str,
             item.value,
             item.footprint,
             str(item.quantity),
@@ -98,7 +128,7 @@ class JLCPCBExporter(BOMExporter):
     
     def format_row(self, item: BOMItem) -> list[str]:
         return [
-            ",".join(sorted(item.designators)),
+            item.designator_str,
             item.footprint,
             str(item.quantity),
             item.fields.get("lcsc", item.fields.get("jlcpcb", "")),
@@ -120,7 +150,7 @@ class MPNExporter(BOMExporter):
         return [
             item.fields.get("mpn", ""),
             str(item.quantity),
-            ",".join(sorted(item.designators)),
+            item.designator_str,
         ]
 
 
@@ -135,7 +165,7 @@ class LCSCExporter(BOMExporter):
         return [
             item.fields.get("lcsc", item.fields.get("jlcpcb", "")),
             str(item.quantity),
-            ",".join(sorted(item.designators)),
+            item.designator_str,
         ]
 
 
@@ -160,16 +190,64 @@ def register_exporter(exporter_class: type[BOMExporter]):
         register_exporter(MyVendorExporter)
     """
     _exporters[exporter_class.name] = exporter_class
+    get_exporter.cache_clear()
 
 
+@functools.lru_cache(maxsize=None)
 def get_exporter(name: str) -> BOMExporter:
-    """Get an exporter by name."""
+    """
+    Get an exporter by name.
+    
+    Exporters are stateless, so one shared instance is kept per name;
+    registering an exporter drops the cached instances.
+    """
     if name not in _exporters:
         available = ", ".join(_exporters.keys())
         raise ValueError(f"Unknown BOM format: {name!r}. Available: {available}")
     return _exporters[name]()
 
 
+def _group_key_value_footprint(part: Part) -> str:
+    return f"{part.value}|{part.footprint}"
+
+
+def _group_key_mpn(part: Part) -> str:
+    mpn = part.fields.get("mpn")
+    return mpn if mpn is not None else f"{part.value}|{part.footprint}"
+
+
+def _group_key_ref(part: Part) -> str:
+    return part.ref
+
+
+# generate_bom group_by -> grouping key for a part
+_GROUP_KEYS = {
+    "value+footprint": _group_key_value_footprint,
+    "mpn": _group_key_mpn,
+    "none": _group_key_ref,
+}
+
+
+def _bom_item(parts: list[Part]) -> BOMItem:
+    """Build the BOM line for one group of parts."""
+    # One pass over the group collects designators and merges vendor
+    # fields; later non-empty values (part numbers) win, as does the last
+    # part for the descriptive columns.
+    designators = []
+    fields = {}
+    for p in parts:
+        designators.append(p.ref)
+        fields.update((name, value) for name, value in p.fields.items() if value)
+    last = parts[-1]
+    return BOMItem(
+        designators=designators,
+        value=last.value,
+        footprint=last.footprint,
+        description=last.name,
+        fields=fields,
+    )
+
+
 def generate_bom(
     path: str | Path,
     format: str = "generic",
@@ -194,49 +272,33 @@ def generate_bom(
     if circuit is None:
         circuit = get_circuit()
     
-    # Group parts into BOM items
-    groups: dict[str, BOMItem] = defaultdict(
-        lambda: BOMItem(designators=[], fields={})
-    )
+    # Group parts, then build one BOMItem per group
+    groups: dict[str, list[Part]] = defaultdict(list)
     
-    for part in circuit.parts:
-        # Create grouping key
-        if group_by == "none":
-            key = part.ref
-        elif group_by == "mpn":
-            key = part.fields.get("mpn", f"{part.value}|{part.footprint}")
-        else:  # value+footprint (default)
-            key = f"{part.value}|{part.footprint}"
-        
-        # Add to group
-        item = groups[key]
-        item.designators.append(part.ref)
-        item.value = part.value
-        item.footprint = part.footprint
-        item.description = part.name
-        
-        # Merge fields (vendor part numbers)
-        for field_name, field_value in part.fields.items():
-            if field_value:
-                item.fields[field_name] = field_value
+    # Pick the grouping key once; anything unknown groups by value+footprint
+    group_key = _GROUP_KEYS.get(group_by, _group_key_value_footprint)
     
-    # Calculate quantities
-    items = []
-    for item in groups.values():
-        item.quantity = len(item.designators)
-        items.append(item)
+    for part in circuit.parts:
+        groups[group_key(part)].append(part)
     
-    # Sort by designator
-    items.sort(key=lambda x: x.designators[0] if x.designators else "")
+    # Sort groups by first designator; BOMItems are then built one at a
+    # time as the exporter writes them
+    ordered = sorted(groups.values(), key=lambda parts: parts[0].ref)
     
     # Export
     exporter = get_exporter(format)
-    exporter.export(items, path)
+    exporter.export(map(_bom_item, ordered), path)
     
-    print(f"BOM: {len(items)} line items, {sum(i.quantity for i in items)} total parts")
+    print(f"BOM: {len(ordered)} line items, {sum(map(len, ordered))} total parts")
     print(f"  → {path}")
 
 
+# Tolerance hierarchy for consolidation, tightest first
+_TOLERANCE_ORDER = ['0.1%', '0.5%', '1%', '2%', '5%', '10%', '20%']
+_TOLERANCE_INDEX = {tol: i for i, tol in enumerate(_TOLERANCE_ORDER)}
+_TOLERANCE_DEFAULT_INDEX = _TOLERANCE_INDEX['5%']
+
+
 def reduce_bom(circuit=None, verbose: bool = True, apply: bool = False) -> dict[str, list[str]]:
     """
     Analyze BOM for consolidation opportunities.
@@ -265,15 +327,11 @@ def reduce_bom(circuit=None, verbose: bool = True, apply: bool = False) -> dict[
     if circuit is None:
         circuit = get_circuit()
     
-    # Tolerance hierarchy for consolidation
-    TOLERANCE_ORDER = ['0.1%', '0.5%', '1%', '2%', '5%', '10%', '20%']
-    
     # Group parts by type+value+footprint, ignoring tolerance
-    groups: dict[str, list] = {}
+    groups: dict[str, list] = defaultdict(list)
     for part in circuit.parts:
         # Key without tolerance
-        key = f"{part.name}|{part.value}|{part.footprint}"
-        groups.setdefault(key, []).append(part)
+        groups[f"{part.name}|{part.value}|{part.footprint}"].append(part)
     
     consolidations = {}
     savings = 0
@@ -286,15 +344,12 @@ def reduce_bom(circuit=None, verbose: bool = True, apply: bool = False) -> dict[
         tolerances = {}
         for p in parts:
             tol = p.fields.get('tolerance', '5%')  # Default 5%
-            try:
-                idx = TOLERANCE_ORDER.index(tol)
-            except ValueError:
-                idx = 4  # Default to 5% if unknown
+            idx = _TOLERANCE_INDEX.get(tol, _TOLERANCE_DEFAULT_INDEX)  # Unknown -> 5%
             tolerances[p.ref] = (idx, tol)
         
         # Find the tightest (lowest index) tolerance
         min_idx = min(t[0] for t in tolerances.values())
-        tightest_tol = TOLERANCE_ORDER[min_idx]
+        tightest_tol = _TOLERANCE_ORDER[min_idx]
         
         # Check if we can consolidate (all parts could use the tightest)
         could_consolidate = []
@@ -11,12 +11,13 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from .api import Circuit
     from .models.part import Part
     from .models.net import Net
     from .models.pin import Pin
 
 
-@dataclass
+@dataclass(slots=True)
 class Group:
     """
     Groups parts for PCB layout hints.
@@ -32,6 +33,10 @@ class Group:
     name: str
     parts: list = field(default_factory=list)
     
+    # Set while used as a context manager
+    _circuit: Circuit | None = field(default=None, init=False, repr=False, compare=False)
+    _start_count: int = field(default=0, init=False, repr=False, compare=False)
+    
     def __enter__(self):
         """Context manager for grouping parts."""
         from .api import get_circuit
@@ -108,5 +113,10 @@ def no_connect(*pins):
         no_connect(u1['NC1'], u1['NC2'])
         no_connect(u1['PA5 PA6 PA7'])
     """
-    for pin in pins:
-        NC += pin
+    from .models.pin import Pin
+    
+    for item in pins:
+        if isinstance(item, Pin):
+            item._no_connect = True
+        else:
+            NC._mark(item)
@@ -6,9 +6,10 @@ uniformly across the library.
 """
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Callable, Iterable
 import math
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Point:
     """A point in 2D space."""
     x: float
@@ -25,7 +26,7 @@ class Point:
     def distance_to(self, other: Point) -> float:
         return math.hypot(self.x - other.x, self.y - other.y)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Vector:
     """A vector in 2D space."""
     dx: float
@@ -48,53 +49,71 @@ class Transform:
         self.y = y
         self.rotation = rotation
     
+    @property
+    def rotation(self) -> float:
+        """Rotation angle in degrees (CCW)."""
+        return self._rotation_deg
+    
+    @rotation.setter
+    def rotation(self, value: float):
+        self._rotation_deg = value
+        self._rotate = _rotation_for(value)
+    
     def transform_point(self, pt: tuple[float, float] | Point) -> Point:
         """Apply rotation then translation to a point relative to (0,0)."""
         px = pt.x if isinstance(pt, Point) else pt[0]
         py = pt.y if isinstance(pt, Point) else pt[1]
         
-        # Apply Rotation
-        # Standard math CCW rotation:
-        # x' = x cos θ - y sin θ
-        # y' = x sin θ + y cos θ
+        rx, ry = self._rotate(px, py)
         
-        rad = math.radians(self.rotation)
-        cos_a = math.cos(rad)
-        sin_a = math.sin(rad)
-        
-        # Determine integer-like rotation for precision
-        if self.rotation % 90 == 0:
-            rot = self.rotation % 360
-            if rot == 0:
-                rx, ry = px, py
-            elif rot == 90:
-                rx, ry = -py, px  # CCW 90: (1,0) -> (0,1) | (0,1) -> (-1,0) -> x=0, y=1?
-                # KiCad 90 is R 90.
-                # If point is (10, 0) (Right), R90 puts it at (0, 10) (Bottom? No, Up in Math).
-                # In KiCad (+Y Down), Up is -Y.
-                # So if we use Math coords internally, (0, 10) is Up.
-                # If we use KiCad coords internally, (0, 10) is Down.
-                # Let's STICK TO KICAD COORDS consistently.
-                # In KiCad Editor: (+X Right, +Y Down).
-                # Rotation is CCW (Standard).
-                # If I have a point at (10, 0) (Right). Rotate 90 CCW.
-                # It goes UP. Up is -Y. So (0, -10).
-                # Math: (10,0) -> (0, 10). (+Y is Up).
-                # So KiCad R90 behavior: (x, y) -> (y, -x).
-                rx, ry = py, -px
-            elif rot == 180:
-                rx, ry = -px, -py
-            elif rot == 270:
-                rx, ry = -py, px
-            else:
-                rx = px * cos_a - py * sin_a
-                ry = px * sin_a + py * cos_a
-        else:
-            rx = px * cos_a - py * sin_a
-            ry = px * sin_a + py * cos_a
-            
         # Apply Translation
         return Point(rx + self.x, ry + self.y)
+    
+    def transform_points(self, pts: Iterable[tuple[float, float] | Point]) -> list[Point]:
+        """
+        Transform many points, e.g. all pins of a placed symbol.
+        
+        Same result as transform_point on each, with the per-point
+        attribute lookups hoisted out of the loop.
+        """
+        rotate = self._rotate
+        tx, ty = self.x, self.y
+        result = []
+        for pt in pts:
+            if isinstance(pt, Point):
+                rx, ry = rotate(pt.x, pt.y)
+            else:
+                rx, ry = rotate(pt[0], pt[1])
+            result.append(Point(rx + tx, ry + ty))
+        return result
+
+
+# Exact rotations for multiples of 90 degrees, keyed by angle % 360.
+# Shared by Transform and kicad_rotation_matrix.
+_EXACT_ROTATIONS: dict[float, Callable[[float, float], tuple[float, float]]] = {
+    0: lambda px, py: (px, py),
+    90: lambda px, py: (py, -px),
+    180: lambda px, py: (-px, -py),
+    270: lambda px, py: (-py, px),
+}
+
+
+def _rotation_for(rotation: float) -> Callable[[float, float], tuple[float, float]]:
+    """
+    Rotation by `rotation` degrees as an (x, y) -> (x', y') function.
+    
+    Multiples of 90 use exact sign/swap rules (KiCad coords, +Y down:
+    R90 takes (x, y) to (y, -x)) with no trig at all; other angles use
+    the standard CCW rotation x' = x cos θ - y sin θ, y' = x sin θ + y cos θ
+    with cos/sin computed once here.
+    """
+    if rotation % 90 == 0:
+        return _EXACT_ROTATIONS[rotation % 360]
+    
+    rad = math.radians(rotation)
+    cos_a = math.cos(rad)
+    sin_a = math.sin(rad)
+    return lambda px, py: (px * cos_a - py * sin_a, px * sin_a + py * cos_a)
 
 def kicad_rotation_matrix(rot: int, x: float, y: float) -> tuple[float, float]:
     """
@@ -102,13 +121,19 @@ def kicad_rotation_matrix(rot: int, x: float, y: float) -> tuple[float, float]:
     KiCad Coordinate System: +X Right, +Y Down.
     Rotation is Counter-Clockwise.
     """
-    rot = rot % 360
-    if rot == 0:
-        return x, y
-    elif rot == 90:
-        return y, -x 
-    elif rot == 180:
-        return -x, -y
-    elif rot == 270:
-        return -y, x
-    return x, y # Fallback
+    rotate = _EXACT_ROTATIONS.get(rot % 360)
+    if rotate is None:
+        return x, y  # Fallback: only multiples of 90 are supported
+    return rotate(x, y)
+
+
+def kicad_rotate_points(rot: int, points: Iterable[tuple[float, float]]) -> list[tuple[float, float]]:
+    """
+    Apply kicad_rotation_matrix to many points with the same rotation.
+    
+    The rotation is looked up once for the whole batch.
+    """
+    rotate = _EXACT_ROTATIONS.get(rot % 360)
+    if rotate is None:
+        return [(x, y) for x, y in points]
+    return [rotate(x, y) for x, y in points]
@@ -14,18 +14,22 @@ import contextvars
 from .models.net import Net
 
 
-# Context variable for tracking subcircuit hierarchy
-_subcircuit_stack: contextvars.ContextVar[list[str]] = contextvars.ContextVar(
-    '_subcircuit_stack', default=[]
+# Context variable holding the current hierarchy as (path, prefix), e.g.
+# ("a.b", "a.b."). Both strings are built once on subcircuit entry, so
+# nothing is copied or joined when parts and nets read them.
+_subcircuit_scope: contextvars.ContextVar[tuple[str, str]] = contextvars.ContextVar(
+    '_subcircuit_scope', default=("", "")
 )
 
 
 def get_hierarchy_prefix() -> str:
     """Get current hierarchical prefix for naming."""
-    stack = _subcircuit_stack.get()
-    if stack:
-        return ".".join(stack) + "."
-    return ""
+    return _subcircuit_scope.get()[1]
+
+
+def get_hierarchy_path() -> str:
+    """Get current subcircuit path (the prefix without its trailing dot)."""
+    return _subcircuit_scope.get()[0]
 
 
 class SubCircuitContext:
@@ -36,14 +40,13 @@ class SubCircuitContext:
         self._token = None
     
     def __enter__(self):
-        stack = _subcircuit_stack.get().copy()
-        stack.append(self.name)
-        self._token = _subcircuit_stack.set(stack)
+        path = f"{_subcircuit_scope.get()[1]}{self.name}"
+        self._token = _subcircuit_scope.set((path, f"{path}."))
         return self
     
     def __exit__(self, *args):
         if self._token:
-            _subcircuit_stack.reset(self._token)
+            _subcircuit_scope.reset(self._token)
 
 
 def subcircuit(func: Callable) -> Callable:
@@ -113,11 +116,14 @@ class Interface:
     
     def __getattr__(self, name: str) -> Net:
         """Access net by attribute name."""
+        # Private names are never nets; this also stops a missing _nets
+        # (e.g. while unpickling) from recursing back in here
         if name.startswith('_'):
             raise AttributeError(name)
-        nets = object.__getattribute__(self, '_nets')
-        if name in nets:
-            return nets[name]
+        try:
+            return self._nets[name]
+        except KeyError:
+            pass
         raise AttributeError(f"Interface has no net '{name}'")
     
     def __setattr__(self, name: str, value: Net):
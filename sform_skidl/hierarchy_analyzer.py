@@ -4,73 +4,93 @@ Hierarchy Analysis for Schematic Generation.
 
 from dataclasses import dataclass, field
 from collections import defaultdict
-from typing import Set, Dict, List
+from typing import Set, Dict, List, Tuple
 
 from .models.part import Part
 from .models.net import Net
 
-@dataclass
+@dataclass(slots=True)
 class HierarchyNode:
     name: str  # Hierarchy path (e.g. "", "regulator_1")
     parts: List[Part] = field(default_factory=list)
     children: Dict[str, 'HierarchyNode'] = field(default_factory=dict)
     ports: List[Net] = field(default_factory=list)  # Nets that cross boundary (List to avoid hash requirement)
+    _port_ids: Set[int] = field(default_factory=set, init=False, repr=False, compare=False)  # id() of each net in ports
+    
+    def __post_init__(self):
+        self._port_ids.update(map(id, self.ports))
     
     @property
     def is_root(self):
         return self.name == ""
+    
+    def add_port(self, net: Net):
+        """Append `net` to ports unless this exact net is already there."""
+        net_id = id(net)
+        if net_id not in self._port_ids:
+            self._port_ids.add(net_id)
+            self.ports.append(net)
 
 class HierarchyAnalyzer:
     def __init__(self, parts: List[Part], nets: List[Net]):
         self.parts = parts
         self.nets = nets
         self.nodes: Dict[str, HierarchyNode] = {}
+        # id(part) -> nets touching that part (filled by analyze())
+        self.part_nets: Dict[int, List[Net]] = defaultdict(list)
         
     def analyze(self) -> HierarchyNode:
-        # 1. Partition Parts
+        # 1. Partition Parts (one lookup per part; nodes made on first use)
+        nodes = self.nodes
         for part in self.parts:
             # part.hierarchy assumed to be set (default "")
             h_path = getattr(part, "hierarchy", "")
-            if h_path not in self.nodes:
-                self.nodes[h_path] = HierarchyNode(name=h_path)
-            self.nodes[h_path].parts.append(part)
+            node = nodes.get(h_path)
+            if node is None:
+                node = nodes[h_path] = HierarchyNode(name=h_path)
+            node.parts.append(part)
             
         # Ensure Root exists
         if "" not in self.nodes:
             self.nodes[""] = HierarchyNode(name="")
             
         # 2. Analyze Nets for Ports
-        # Map NetID -> Set of Hierarchy Paths it touches
-        net_ownership: Dict[int, Set[str]] = defaultdict(set)
-        net_map: Dict[int, Net] = {}
+        # (net, hierarchy paths it touches), in circuit order
+        net_owners: List[Tuple[Net, Set[str]]] = []
+        part_nets = self.part_nets
         
         for net in self.nets:
-            net_id = id(net)
-            net_map[net_id] = net
-            for pin in net.pins:
-                if pin.part:
-                    h_path = getattr(pin.part, "hierarchy", "")
-                    net_ownership[net_id].add(h_path)
+            owners = set()
+            for pin in net._pins:
+                part = pin._part
+                if part is not None:
+                    owners.add(part.hierarchy)
+                    nets = part_nets[id(part)]
+                    if not nets or nets[-1] is not net:
+                        nets.append(net)
+            if owners:
+                net_owners.append((net, owners))
                     
-        # 3. Identify Ports
+        # 3. Identify Ports: a net touching more than one sheet is a port
+        # of every non-root sheet it touches. Nets are visited once, in
+        # circuit order, so each node's ports keep that order.
         root = self.nodes[""]
         
-        for h_path, node in self.nodes.items():
-            if h_path == "": continue
-            
-            # Check Nets
-            for net_id, owners in net_ownership.items():
-                if h_path in owners:
-                    # Does it touch others?
-                    if len(owners) > 1:
-                        # Shared net -> PORT
-                        net = net_map[net_id]
-                        if net not in node.ports:
-                            node.ports.append(net)
-                        pass
+        for net, owners in net_owners:
+            if len(owners) < 2:
+                continue
+            for h_path in owners:
+                node = self.nodes.get(h_path) if h_path else None
+                if node is not None:
+                    node.add_port(net)
 
         # 4. Build Tree
         return root
 
     def get_sheet_structure(self) -> Dict[str, HierarchyNode]:
         return self.nodes
+
+    def nets_for_parts(self, parts: List[Part]) -> List[Net]:
+        """Nets touching any of `parts`, in circuit order."""
+        net_ids = {id(n) for p in parts for n in self.part_nets.get(id(p), ())}
+        return [n for n in self.nets if id(n) in net_ids]
@@ -6,6 +6,7 @@ from .symbol_lib import (
     find_kicad_symbols,
     SymbolLibrary,
     add_lib_path,
+    enable_lib_cache,
     lib_search_paths,
     clear_lib_paths,
     auto_discover_libs,
@@ -21,6 +22,7 @@ __all__ = [
     "SymbolLibrary",
     "SchematicWriter",
     "add_lib_path",
+    "enable_lib_cache",
     "lib_search_paths",
     "clear_lib_paths",
     "auto_discover_libs",
@@ -8,22 +8,95 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
+from itertools import starmap
+from typing import Iterator
+import math
+import os
+import re
 import uuid
 
-from ..sexpr import serialize_to_file
+from ..sexpr import SExprText, format_atom, serialize_block_to_file
 from ..models.part import Part
 from ..models.net import Net
+from ..models.pin import Pin
+from ..geometry import kicad_rotate_points, kicad_rotation_matrix
+from ..routing import Router
 
 
-@dataclass
+# Hex digit at the UUID variant position -> same digit with RFC 4122 bits set
+_UUID_VARIANT = {c: "89ab"[int(c, 16) & 3] for c in "0123456789abcdef"}
+
+
+def _fast_uuids(n: int) -> list[str]:
+    """
+    Generate `n` random (version 4) UUID strings from one entropy read.
+    
+    Equivalent to `[str(uuid.uuid4()) for _ in range(n)]`, but reads
+    os.urandom once and formats the hex directly, without building a
+    UUID object per id.
+    """
+    h = os.urandom(16 * n).hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-4{h[i + 13:i + 16]}-"
+        f"{_UUID_VARIANT[h[i + 16]]}{h[i + 17:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, 32 * n, 32)
+    ]
+
+
+# Likely power nets (case insensitive): anything starting with VCC/VDD/GND,
+# or exactly one of the other common rail names
+_POWER_NET_RE = re.compile(r"vcc|vdd|gnd|(?:v\+|3v3|5v|12v|vin|vss|batt\+)\Z", re.IGNORECASE | re.ASCII)
+
+
+# Label shape keywords (case insensitive), checked in priority order: any
+# output keyword wins over an input one, which wins over a bidirectional one.
+# Each alternative is a lookahead over the whole name, so `lastindex` tells
+# which group matched first in that order.
+_LABEL_SHAPE_RE = re.compile(
+    r"(?=.*?(out|tx|mosi|scl|clk))"
+    r"|(?=.*?(in|rx|miso))"
+    r"|(?=.*?(bidir|data|sda|io))",
+    re.IGNORECASE | re.ASCII | re.DOTALL,
+)
+_LABEL_SHAPES = {1: "output", 2: "input", 3: "bidirectional"}
+
+
+def _label_shape(name: str) -> str:
+    """Global label shape for a net name; input (points right) by default."""
+    m = _LABEL_SHAPE_RE.match(name)
+    return _LABEL_SHAPES[m.lastindex] if m else "input"
+
+
+def _stub(rel_x: float, rel_y: float, length: float = 5.08) -> tuple[float, float, int]:
+    """
+    Stub offset along the dominant axis of (rel_x, rel_y), plus the net
+    label rotation facing the same way.
+    
+    Label orientation: 0 Right, 90 Up, 180 Left, 270 Down (KiCad +Y is
+    down, so a stub with negative dy goes up).
+    """
+    if abs(rel_x) > abs(rel_y):
+        return (length, 0, 0) if rel_x >= 0 else (-length, 0, 180)
+    return (0, length, 270) if rel_y >= 0 else (0, -length, 90)
+
+
+def _grid_key(pos: tuple[float, float]) -> tuple[int, int]:
+    """Snap a position to the 0.05 mm connection tolerance grid."""
+    return (round(pos[0] * 20), round(pos[1] * 20))
+
+
+@dataclass(slots=True)
 class PlacedPart:
     """A part placed on the schematic."""
     part: Part
     position: tuple[float, float]
     rotation: int = 0
+    # Pin extent on the sheet as (center x, center y, width, height),
+    # or None for a part without pins
+    bbox: tuple[float, float, float, float] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WireSegment:
     """A wire segment connecting two points."""
     start: tuple[float, float]
@@ -69,8 +142,18 @@ class SchematicWriter:
         self._uuid = str(uuid.uuid4())
         
         self._placed_parts: list[PlacedPart] = []
-        self._wires: list[WireSegment] = []
-        self._junctions: list[tuple[float, float]] = []
+        # id(part) -> first placement of that part, and a lazily built
+        # id(pin) -> absolute position table (reset whenever a part is added)
+        self._placed_index: dict[int, PlacedPart] = {}
+        self._pin_pos_cache: dict[int, tuple[float, float]] | None = None
+        # Every placed part is registered as a routing obstacle when added
+        self._router = Router()
+        # Pre-generated UUIDs for built items, refilled in batches
+        self._uuid_pool: list[str] = []
+        # Wires and junctions keyed by their snapped coordinates, so the
+        # same segment (either direction) or junction is only drawn once
+        self._wires: dict[frozenset, WireSegment] = {}
+        self._junctions: dict[tuple[int, int], tuple[float, float]] = {}
         self._labels: list[tuple[str, tuple[float, float]]] = []
     
     def add_part(self, part: Part, position: tuple[float, float] | None = None, rotation: int = 0):
@@ -85,20 +168,83 @@ class SchematicWriter:
         if position is None:
             position = self._next_position()
         
-        self._placed_parts.append(PlacedPart(part, position, rotation))
+        placed = PlacedPart(part, position, rotation)
+        self._placed_parts.append(placed)
+        self._placed_index.setdefault(id(part), placed)
+        self._pin_pos_cache = None
+        
+        # Estimate the part's extent from its pins for the router
+        offsets = self._rotated_pin_offsets(placed)
+        if offsets:
+            px, py = position
+            xs = [px + rx for _, rx, _ in offsets]
+            ys = [py - ry for _, _, ry in offsets]
+            min_x, max_x = min(xs), max(xs)
+            min_y, max_y = min(ys), max(ys)
+            placed.bbox = ((min_x + max_x) / 2, (min_y + max_y) / 2, max_x - min_x, max_y - min_y)
+            self._router.add_obstacle(*placed.bbox)
     
     def add_wire(self, start: tuple[float, float], end: tuple[float, float]):
         """Add a wire segment."""
-        self._wires.append(WireSegment(start, end))
+        key = frozenset((_grid_key(start), _grid_key(end)))
+        self._wires.setdefault(key, WireSegment(start, end))
     
     def add_junction(self, position: tuple[float, float]):
         """Add a junction point."""
-        self._junctions.append(position)
+        self._junctions.setdefault(_grid_key(position), position)
     
     def add_label(self, name: str, position: tuple[float, float], rotation: int = 0):
         """Add a net label."""
         self._labels.append((name, position, rotation))
     
+    def _rotated_pin_offsets(self, placed: PlacedPart) -> list[tuple[Pin, float, float]]:
+        """Pins of a placed part with their offsets rotated into sheet orientation."""
+        pins = placed.part._pin_list
+        offsets = kicad_rotate_points(placed.rotation, [pin.position for pin in pins])
+        return [(pin, rx, ry) for pin, (rx, ry) in zip(pins, offsets)]
+    
+    def _pin_positions(self) -> dict[int, tuple[float, float]]:
+        """Absolute position of every placed pin, keyed by id(pin)."""
+        if self._pin_pos_cache is None:
+            positions = {}
+            for placed in self._placed_parts:
+                px, py = placed.position
+                for pin, rx, ry in self._rotated_pin_offsets(placed):
+                    # KiCad Symbol Y is Up, Schematic Y is Down -> Subtract RY
+                    positions.setdefault(id(pin), (px + rx, py - ry))
+            self._pin_pos_cache = positions
+        return self._pin_pos_cache
+    
+    def _pin_pos(self, pin: Pin) -> tuple[float, float]:
+        """Absolute position of a pin, or (0, 0) if its part isn't placed."""
+        pos = self._pin_positions().get(id(pin))
+        if pos is not None:
+            return pos
+        
+        # Pins no longer listed on their part (e.g. replaced by set_pin_count)
+        placed = self._placed_index.get(id(pin.part)) if pin.part else None
+        if placed is None:
+            return (0, 0)
+        dx, dy = pin.position
+        rx, ry = kicad_rotation_matrix(placed.rotation, dx, dy)
+        return (placed.position[0] + rx, placed.position[1] - ry)
+    
+    def _new_uuid(self) -> str:
+        """Take a fresh UUID string from the pool, refilling it if empty."""
+        if not self._uuid_pool:
+            self._uuid_pool = _fast_uuids(256)
+        return self._uuid_pool.pop()
+    
+    def _new_uuids(self, n: int) -> list[str]:
+        """Take `n` fresh UUID strings from the pool in one slice."""
+        pool = self._uuid_pool
+        if len(pool) < n:
+            pool += _fast_uuids(n - len(pool))
+        start = len(pool) - n
+        taken = pool[start:]
+        del pool[start:]
+        return taken
+    
     def _next_position(self) -> tuple[float, float]:
         """Calculate next auto-placement position."""
         n = len(self._placed_parts)
@@ -110,30 +256,28 @@ class SchematicWriter:
     
     def auto_place_parts(self, parts: list[Part]):
         """Auto-place a list of parts on the schematic."""
-        for part in parts:
-            self.add_part(part)
+        # Same grid as _next_position, stepping the slot index directly
+        per_row = self.PARTS_PER_ROW
+        x0, y0, step = self.START_X, self.START_Y, self.GRID_SPACING
+        for n, part in enumerate(parts, len(self._placed_parts)):
+            row, col = divmod(n, per_row)
+            self.add_part(part, (x0 + col * step, y0 + row * step))
 
     def auto_inject_power_flags(self, nets: list[Net]):
         """
         Automatically add PWR_FLAG symbols to power nets that lack a driver.
         This suppresses KiCad ERC "Net has only passive pins" warnings.
         """
-        from .symbol_lib import get_library
         from ..models.pin import PinType
         
-        # Power net names (case insensitive)
-        power_names = {'vcc', 'vdd', 'v+', '3v3', '5v', '12v', 'vin', 'gnd', 'vss', 'batt+'}
-        
         for net in nets:
             if not net.name: continue
             
             # Check if likely power net
-            is_power_net = net.name.lower() in power_names or net.name.lower().startswith(('vcc', 'vdd', 'gnd'))
-            
-            if not is_power_net: continue
+            if not _POWER_NET_RE.match(net.name): continue
             
             # Check for driver
-            has_driver = any(p.pin_type == PinType.POWER_OUT for p in net.pins)
+            has_driver = net._type_counts.get(PinType.POWER_OUT, 0) > 0
             
             if not has_driver and net.pins:
                 # Add PWR_FLAG
@@ -165,16 +309,9 @@ class SchematicWriter:
                 # Find a pin that IS placed
                 target_pos = None
                 for pin in net.pins:
-                    if pin.part:
-                        for placed in self._placed_parts:
-                            if placed.part == pin.part:
-                                # Get absolute pos
-                                from ..geometry import kicad_rotation_matrix
-                                dx, dy = pin.position
-                                rx, ry = kicad_rotation_matrix(placed.rotation, dx, dy)
-                                target_pos = (placed.position[0] + rx, placed.position[1] - ry)
-                                break
-                    if target_pos: break
+                    if pin.part and id(pin.part) in self._placed_index:
+                        target_pos = self._pin_pos(pin)
+                        break
                     
                 if target_pos:
                     # Place flag nearby (e.g. 5mm Up or Left)
@@ -195,39 +332,40 @@ class SchematicWriter:
         """
         Verify wiring integrity and optionally fix issues.
         """
-        from ..geometry import Point, kicad_rotation_matrix
-        
         print("\nVerifying schematic wiring...")
         warnings = []
         fixed_count = 0
         
-        # Helper: Build set of all wire endpoints (with tolerance) to check connectivity
-        def get_endpoints():
-            eps = []
-            for w in self._wires:
-                eps.append(w.start)
-                eps.append(w.end)
-            return eps
-            
-        endpoints = get_endpoints()
+        # Bucket wire endpoints on a grid of the match tolerance, so a pin
+        # only needs to be compared with endpoints in its own and the
+        # eight neighbouring cells instead of with every endpoint.
+        tol = 0.05
+        buckets: dict[tuple[int, int], list[tuple[float, float]]] = {}
+        
+        def add_endpoint(pos):
+            key = (math.floor(pos[0] / tol), math.floor(pos[1] / tol))
+            buckets.setdefault(key, []).append(pos)
+        
+        for w in self._wires.values():
+            add_endpoint(w.start)
+            add_endpoint(w.end)
             
-        def is_connected(pos, current_endpoints):
-            for ep in current_endpoints:
-                if abs(ep[0] - pos[0]) < 0.05 and abs(ep[1] - pos[1]) < 0.05:
-                    return True
+        def is_connected(pos):
+            cx = math.floor(pos[0] / tol)
+            cy = math.floor(pos[1] / tol)
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    for ep in buckets.get((gx, gy), ()):
+                        if abs(ep[0] - pos[0]) < tol and abs(ep[1] - pos[1]) < tol:
+                            return True
             return False
             
         # Check pins of complex parts
         for placed in self._placed_parts:
+            px, py = placed.position
 
             # Check each pin
-            for pin in placed.part.pins:
-                # Calculate absolute pin pos 
-                px, py = placed.position
-                dx, dy = pin.position
-                rot = placed.rotation
-                
-                rx, ry = kicad_rotation_matrix(rot, dx, dy)
+            for pin, rx, ry in self._rotated_pin_offsets(placed):
                 # KiCad Symbol Y is Up, Schematic Y is Down -> Subtract RY
                 abs_pos = (px + rx, py - ry)
                 
@@ -247,50 +385,24 @@ class SchematicWriter:
                     elif net.name and not net.name.startswith("Net"):
                          should_connect = True
                 
-                status = "Connected" if is_connected(abs_pos, endpoints) else "OPEN"
-                
-                if should_connect and status == "OPEN":
+                if should_connect and not is_connected(abs_pos):
                      msg = f"Pin {placed.part.ref}.{pin.name} ({net.name}) at {abs_pos} seems unconnected."
                      warnings.append(msg)
                      
                      if auto_fix:
                         print(f"  [AUTO-FIX] {msg} -> Adding rescue wire.")
-                        # ... (Auto fix logic same as before) ...
-                        # ...
-                        target_pos = None
-                        for lbl_name, lbl_pos, _ in self._labels:
-                            if lbl_name == net.name:
-                                target_pos = lbl_pos
-                                break
-                        
-                        stub_len = 5.08
+                        # The rescue is a short stub ending in a label of the
+                        # net's name, so no existing label has to be found
                         # Try to point away from center
-                        if abs(rx) > abs(ry):
-                            stub_dx = stub_len if rx >= 0 else -stub_len
-                            stub_dy = 0
-                        else:
-                            stub_dx = 0
-                            stub_dy = stub_len if ry >= 0 else -stub_len
-                            
+                        stub_dx, stub_dy, rot = _stub(rx, ry)
                         end_pos = (abs_pos[0] + stub_dx, abs_pos[1] + stub_dy)
                         
                         self.add_wire(abs_pos, end_pos)
-                        
-                        rot = 0
-                        if stub_dx < -0.1: rot = 180
-                        elif stub_dy < -0.1: rot = 90
-                        elif stub_dy > 0.1: rot = 270
-                        
                         self.add_label(net.name, end_pos, rotation=rot)
                         
-                        endpoints.append(abs_pos)
-                        endpoints.append(end_pos)
+                        add_endpoint(abs_pos)
+                        add_endpoint(end_pos)
                         fixed_count += 1
-                        
-                elif status == "OPEN":
-                     # Diagnostic for why we skipped it
-                     # print(f"    [SKIP] Pin {pin.name} ({net.name if net else 'None'}) - Not required.")
-                     pass
         
         if warnings:
             print(f"  Finding: {len(warnings)} wiring issues found.")
@@ -304,8 +416,6 @@ class SchematicWriter:
         Auto-generate wires and labels for connected nets.
         Strategy: Stub Routing for 'stub_prefixes', Direct Routing for others.
         """
-        from ..geometry import Point, kicad_rotation_matrix
-        
         # Prefixes that trigger stub routing (Complex parts)
         stub_prefixes = ('U', 'IC', 'MCU', 'J', 'P', 'CONN', 'Q', 'D', 'T')
         
@@ -325,99 +435,22 @@ class SchematicWriter:
                             is_stub_net = True
                             break
             
-            # Helper: Get absolute position of a pin applying rotation
-            def get_pin_pos(pin):
-                if pin.part:
-                    for placed in self._placed_parts:
-                        if placed.part is pin.part:
-                            px, py = placed.position
-                            dx, dy = pin.position
-                            rot = placed.rotation
-                            
-                            rx, ry = kicad_rotation_matrix(rot, dx, dy)
-                            # KiCad Symbol Y is Up, Schematic Y is Down -> Subtract RY
-                            return (px + rx, py - ry)
-                return (0, 0)
-            
-            # Helper: Get direction vector for stub
-            def get_stub_vector(start_pos, pin):
-                center = (0,0)
-                if pin.part:
-                    for placed in self._placed_parts:
-                        if placed.part is pin.part:
-                            center = placed.position
-                            break
-                rel_x = start_pos[0] - center[0]
-                rel_y = start_pos[1] - center[1]
-                stub_len = 2.54 * 2
-                
-                if abs(rel_x) > abs(rel_y):
-                    return (stub_len if rel_x >= 0 else -stub_len, 0)
-                else:
-                    return (0, stub_len if rel_y >= 0 else -stub_len)
-
             if is_stub_net and has_name:
                 for pin in pins:
-                    start_pos = get_pin_pos(pin)
-                    stub_dx, stub_dy = get_stub_vector(start_pos, pin)
+                    start_pos = self._pin_pos(pin)
+                    # Stub points away from the part's center
+                    center = (0, 0)
+                    placed = self._placed_index.get(id(pin.part)) if pin.part else None
+                    if placed is not None:
+                        center = placed.position
+                    stub_dx, stub_dy, rot = _stub(start_pos[0] - center[0], start_pos[1] - center[1])
                     end_pos = (start_pos[0] + stub_dx, start_pos[1] + stub_dy)
                     
                     self.add_wire(start_pos, end_pos)
-                    
-                    # Calculate label rotation based on stub direction
-                    # Net Label Orientation:
-                    # 0: Right (standard)
-                    # 90: Up
-                    # 180: Left
-                    # 270: Down
-                    
-                    rot = 0
-                    if stub_dx < 0: rot = 180   # Stub goes Left -> Flag points Left
-                    elif stub_dy < 0: rot = 90  # Stub goes Up -> Flag points Up? (KiCad +Y Down: neg Y is Up)
-                    elif stub_dy > 0: rot = 270 # Stub goes Down -> Flag points Down
-                    
                     self.add_label(net.name, end_pos, rotation=rot)
             else:
-                # Direct Routing (Manhattan)
-                # Initialize router if not exists
-                if not hasattr(self, '_router'):
-                    from ..routing import Router
-                    self._router = Router()
-                    # Add obstacles
-                    for placed in self._placed_parts:
-                        # Estimate bbox from pins
-                        min_x, max_x, min_y, max_y = 0,0,0,0
-                        has_pins = False
-                        
-                        # Use geometry to get absolute pin positions
-                        # Note: We can reuse get_pin_pos logic but independent of specific pin
-                        # Just iterate all pins of the part
-                        # Or simpler: Approx size 10x10mm for small, more for large?
-                        # Better: Iterate pins.
-                        for p in placed.part.pins:
-                            dx, dy = p.position
-                            rx, ry = kicad_rotation_matrix(placed.rotation, dx, dy)
-                            px, py = placed.position
-                            abs_x, abs_y = px + rx, py - ry
-                            
-                            if not has_pins:
-                                min_x, max_x = abs_x, abs_x
-                                min_y, max_y = abs_y, abs_y
-                                has_pins = True
-                            else:
-                                min_x = min(min_x, abs_x)
-                                max_x = max(max_x, abs_x)
-                                min_y = min(min_y, abs_y)
-                                max_y = max(max_y, abs_y)
-                        
-                        if has_pins:
-                            width = max_x - min_x
-                            height = max_y - min_y
-                            cx = (min_x + max_x) / 2
-                            cy = (min_y + max_y) / 2
-                            self._router.add_obstacle(cx, cy, width, height)
-
-                pin_positions = [get_pin_pos(p) for p in pins]
+                # Direct Routing (Manhattan) around the part obstacles
+                pin_positions = [self._pin_pos(p) for p in pins]
                 for i in range(len(pin_positions) - 1):
                     p1 = pin_positions[i]
                     p2 = pin_positions[i + 1]
@@ -455,17 +488,20 @@ class SchematicWriter:
         
         lib_symbols = ["lib_symbols"]
         for lib_id, symbol in symbols.items():
-            # Create embedded symbol with lib_id as name
+            # Create embedded symbol with lib_id as name. Built fresh each
+            # time, as symbols can be edited between builds and callers may
+            # modify the returned tree; checking and copying a cached entry
+            # would cost more than the rebuild.
             sexpr = symbol.to_sexpr()
             # Replace symbol name with lib_id 
             sexpr[1] = lib_id
-            # Fix unit symbol names to include lib prefix
-            for i, item in enumerate(sexpr):
-                if isinstance(item, list) and item[0] == "symbol" and len(item) > 1:
-                    unit_name = item[1]
-                    if "_0_1" in unit_name or "_1_1" in unit_name:
-                        # Replace simple name with prefixed name
-                        item[1] = unit_name.replace(symbol.name, lib_id.split(":")[-1])
+            # Fix unit symbol names to match the lib_id's symbol name. They
+            # already do unless the symbol name itself contains a colon.
+            unit_prefix = lib_id.split(":")[-1]
+            if unit_prefix != symbol.name:
+                # to_sexpr puts the units (graphics _0_1, pins _1_1) last
+                for item in sexpr[-2 if symbol.graphics else -1:]:
+                    item[1] = item[1].replace(symbol.name, unit_prefix)
             lib_symbols.append(sexpr)
         
         return lib_symbols
@@ -486,7 +522,7 @@ class SchematicWriter:
             ["in_bom", "yes" if part._symbol and part._symbol.in_bom else "yes"],
             ["on_board", "yes" if part._symbol and part._symbol.on_board else "yes"],
             ["dnp", "no"],
-            ["uuid", str(uuid.uuid4())],
+            ["uuid", self._new_uuid()],
         ]
         
         # Calculate bounding box from pins to avoid overlap
@@ -495,7 +531,7 @@ class SchematicWriter:
         min_y, max_y = 0.0, 0.0
         
         has_pins = False
-        for pin in part.pins:
+        for pin in part._pin_list:
             has_pins = True
             # Symbol space coordinates
             dx, dy = pin.position
@@ -545,7 +581,10 @@ class SchematicWriter:
         if part.footprint:
             props.append(("Footprint", part.footprint, 0, val_y - 2.54, True))
         
-        for key, value, dx, dy, hidden in props:
+        # All property offsets of the part share one rotation
+        offsets = kicad_rotate_points(placed.rotation, [(dx, dy) for _, _, dx, dy, _ in props])
+        
+        for (key, value, dx, dy, hidden), (rx, ry) in zip(props, offsets):
             # Note: dx, dy are in Symbol Space. 
             # In KiCad 6+, properties are children of symbol instance and inherit rotation?
             # Yes, "at" inside symbol instance is relative to instance "at".
@@ -570,8 +609,6 @@ class SchematicWriter:
             # abs_x = x + rx
             # abs_y = y - ry   <-- Flip Y logic
             
-            from ..geometry import kicad_rotation_matrix
-            rx, ry = kicad_rotation_matrix(placed.rotation, dx, dy)
             prop_x = x + rx
             prop_y = y - ry
             
@@ -586,11 +623,13 @@ class SchematicWriter:
             prop.append(effects)
             instance.append(prop)
         
-        # Add pin UUIDs
-        for pin in part.pins:
+        # Add pin UUIDs, drawn for all pins at once
+        pins = part._pin_list
+        pin_uuids = self._new_uuids(len(pins))
+        for pin, pin_uuid in zip(pins, pin_uuids):
             instance.append([
                 "pin", pin.number,
-                ["uuid", str(uuid.uuid4())],
+                ["uuid", pin_uuid],
             ])
         
         # Add instances section
@@ -615,7 +654,7 @@ class SchematicWriter:
                 ["xy", wire.end[0], wire.end[1]],
             ],
             ["stroke", ["width", 0], ["type", "default"]],
-            ["uuid", str(uuid.uuid4())],
+            ["uuid", self._new_uuid()],
         ]
     
     def _build_junction(self, pos: tuple[float, float]) -> list:
@@ -625,7 +664,7 @@ class SchematicWriter:
             ["at", pos[0], pos[1]],
             ["diameter", 0],
             ["color", 0, 0, 0, 0],
-            ["uuid", str(uuid.uuid4())],
+            ["uuid", self._new_uuid()],
         ]
     
     def _build_label(self, name: str, pos: tuple[float, float], rotation: int = 0) -> list:
@@ -635,40 +674,75 @@ class SchematicWriter:
         Uses global_label with flag shape for better visibility.
         Detects shape based on net name or usage (e.g. VCC/GND/Input/Output).
         """
-        # Determine label style
-        shape = "input"  # Default flag shape (points right)
-        
-        # Simple heuristics for shape
-        lower_name = name.lower()
-        if any(x in lower_name for x in ['out', 'tx', 'mosi', 'scl', 'clk']):
-            shape = "output"  # Points right (arrow)
-        elif any(x in lower_name for x in ['in', 'rx', 'miso']):
-            shape = "input"   # Points right (flat left, arrow right) - KiCad conventions vary
-        elif any(x in lower_name for x in ['bidir', 'data', 'sda', 'io']):
-            shape = "bidirectional"
-        
         return [
             "global_label", name,
-            ["shape", shape],
+            ["shape", _label_shape(name)],
             ["at", pos[0], pos[1], rotation],
             ["fields_autoplaced"],
             ["effects", 
                 ["font", ["size", 1.27, 1.27]], 
                 ["justify", "left"]
             ],
-            ["uuid", str(uuid.uuid4())],
+            ["uuid", self._new_uuid()],
         ]
     
+    # Pre-formatted twins of _build_wire/_build_junction/_build_label, as
+    # serialize would lay them out one level deep. Used when writing to a
+    # file so the many identical skeletons skip the generic formatter.
+    
+    def _wire_text(self, wire: WireSegment) -> SExprText:
+        """Wire section as pre-formatted text."""
+        (x1, y1), (x2, y2) = wire.start, wire.end
+        return SExprText(
+            f"  (wire\n"
+            f"    (pts (xy {format_atom(x1)} {format_atom(y1)}) (xy {format_atom(x2)} {format_atom(y2)}))\n"
+            f"    (stroke\n      (width 0)\n      (type default)\n    )\n"
+            f"    (uuid \"{self._new_uuid()}\")\n"
+            f"  )"
+        )
+    
+    def _junction_text(self, pos: tuple[float, float]) -> SExprText:
+        """Junction section as pre-formatted text."""
+        return SExprText(
+            f"  (junction\n"
+            f"    (at {format_atom(pos[0])} {format_atom(pos[1])})\n"
+            f"    (diameter 0)\n    (color 0 0 0 0)\n"
+            f"    (uuid \"{self._new_uuid()}\")\n"
+            f"  )"
+        )
+    
+    def _label_text(self, name: str, pos: tuple[float, float], rotation: int = 0) -> SExprText:
+        """Global label section as pre-formatted text."""
+        return SExprText(
+            f"  (global_label {format_atom(name)}\n"
+            f"    (shape {_label_shape(name)})\n"
+            f"    (at {format_atom(pos[0])} {format_atom(pos[1])} {format_atom(rotation)})\n"
+            f"    (fields_autoplaced)\n"
+            f"    (effects\n      (font\n        (size 1.27 1.27)\n      )\n      (justify left)\n    )\n"
+            f"    (uuid \"{self._new_uuid()}\")\n"
+            f"  )"
+        )
+    
     def build(self) -> list:
         """Build the complete schematic S-expression."""
-        schematic = [
-            "kicad_sch",
-            ["version", self.version],
-            ["generator", "sform_skidl"],
-            ["generator_version", "0.1"],
-            ["uuid", self._uuid],
-            ["paper", self.paper],
-        ]
+        return ["kicad_sch", *self._iter_items()]
+    
+    def _iter_items(self, as_text: bool = False) -> Iterator[list | SExprText]:
+        """
+        Yield the top-level items of the schematic, in file order.
+        
+        With `as_text`, wires, junctions and labels come out as
+        pre-formatted SExprText for serialize_block_to_file.
+        """
+        build_wire = self._wire_text if as_text else self._build_wire
+        build_junction = self._junction_text if as_text else self._build_junction
+        build_label = self._label_text if as_text else self._build_label
+        
+        yield ["version", self.version]
+        yield ["generator", "sform_skidl"]
+        yield ["generator_version", "0.1"]
+        yield ["uuid", self._uuid]
+        yield ["paper", self.paper]
         
         # Title block
         tb = ["title_block"]
@@ -676,45 +750,39 @@ class SchematicWriter:
         if self.date: tb.append(["date", self.date])
         if self.rev: tb.append(["rev", self.rev])
         if self.company: tb.append(["company", self.company])
-        schematic.append(tb)
-        
-        # Library symbols
-        schematic.append(self._build_lib_symbols())
+        yield tb
         
-        # Wires
-        for wire in self._wires:
-            schematic.append(self._build_wire(wire))
+        # One entropy read for every item UUID below: wires, junctions,
+        # labels, and each symbol plus its pins
+        needed = len(self._wires) + len(self._junctions) + len(self._labels) + sum(
+            1 + placed.part.pin_count for placed in self._placed_parts
+        )
+        if needed > len(self._uuid_pool):
+            self._uuid_pool += _fast_uuids(needed - len(self._uuid_pool))
         
-        # Junctions
-        for junction in self._junctions:
-            schematic.append(self._build_junction(junction))
+        # Library symbols
+        yield self._build_lib_symbols()
         
-        # Labels
-        for item in self._labels:
-            if len(item) == 3:
-                name, pos, rot = item
-            else:
-                name, pos = item
-                rot = 0
-            schematic.append(self._build_label(name, pos, rot))
+        # Wires, junctions and labels (labels are (name, pos[, rotation]))
+        yield from map(build_wire, self._wires.values())
+        yield from map(build_junction, self._junctions.values())
+        yield from starmap(build_label, self._labels)
         
         # Symbol instances
         for placed in self._placed_parts:
             # Check for special Sheet Part (for hierarchy)
             if hasattr(placed.part, "is_sheet") and placed.part.is_sheet:
-                 schematic.append(self._build_sheet_instance(placed))
+                 yield self._build_sheet_instance(placed)
             else:
-                 schematic.append(self._build_symbol_instance(placed))
+                 yield self._build_symbol_instance(placed)
         
         # Sheet instances (Metadata)
-        schematic.append([
+        yield [
             "sheet_instances",
             ["path", "/",
                 ["page", "1"],
             ],
-        ])
-        
-        return schematic
+        ]
 
     def _build_sheet_instance(self, placed: PlacedPart) -> list:
         """Build a hierarchical sheet instance."""
@@ -739,7 +807,7 @@ class SchematicWriter:
         ]
         
         # Add Sheet Pins (Ports)
-        for pin in part.pins:
+        for pin in part._pin_list:
              # Pin pos relative to sheet? or absolute?
              # KiCad Sheet Pin: (pin "Name" type (at X Y 0) ...)
              # X,Y are RELATIVE to Sheet Top-Left (at X Y)? NO.
@@ -774,5 +842,6 @@ class SchematicWriter:
         """
 
         self.verify_wiring()
-        schematic = self.build()
-        serialize_to_file(schematic, Path(path))
+        # Items are serialized as they are built, so the full tree is
+        # never held in memory at once
+        serialize_block_to_file("kicad_sch", self._iter_items(as_text=True), Path(path))
@@ -6,11 +6,18 @@ Parses KiCad symbol library files from the installation directory.
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import os
+import pickle
+import re
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator
 
-from ..sexpr import parse, parse_file, serialize, serialize_to_file
+from ..sexpr import parse, serialize, serialize_to_file
+from ..sexpr.parser import ParseError, _unescape_string
 from ..models.symbol import Symbol
 from ..models.pin import Pin
 
@@ -18,6 +25,57 @@ from ..models.pin import Pin
 # Custom library search paths (checked before KiCad installation)
 lib_search_paths: list[Path] = []
 
+def _default_cache_dir() -> Path | None:
+    """Per-user cache directory ($XDG_CACHE_HOME or ~/.cache), or None without a home."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        try:
+            base = Path.home() / ".cache"
+        except RuntimeError:
+            return None
+    return Path(base) / "sform_skidl"
+
+
+# Directory for pickled, parsed libraries; None (the default) disables the
+# disk cache, see enable_lib_cache(). Unpickling runs code, so this must be
+# private to the user: entries are only read from a directory, and files,
+# that nobody else can write.
+lib_cache_dir: Path | None = None
+
+# Bump when Symbol/Pin change shape so stale pickles are ignored
+_LIB_CACHE_VERSION = 4
+
+
+# Next paren, or quoted string containing a paren: all the index scan needs
+# to track nesting. Other text and paren-free strings are skipped inside
+# the match, so most strings never reach the Python loop. The skip is an
+# unrolled loop (text, then string-and-text repeats) rather than possessive
+# quantifiers, which need Python 3.11.
+_INDEX_TOKEN_RE = re.compile(
+    rb'[^"()]*(?:"(?:[^"\\()]|\\.)*"[^"()]*)*'
+    rb'(?:(\()|(\))|"(?:[^"\\]|\\.)*")'
+)
+
+# Start of a top-level symbol node, capturing its (possibly quoted) name
+_SYMBOL_HEAD_RE = re.compile(rb'\(\s*symbol\s+("(?:[^"\\]|\\.)*"|[^\s()"]+)')
+
+_LIB_HEAD_RE = re.compile(rb'\s*\(\s*kicad_symbol_lib[\s()]')
+
+
+def enable_lib_cache(directory: str | Path | None = None):
+    """
+    Cache parsed symbol libraries on disk across runs.
+    
+    Each library gets one pickle file, replaced whenever the library
+    changes. The cache is off unless this is called.
+    
+    Args:
+        directory: Cache directory; defaults to sform_skidl under
+            $XDG_CACHE_HOME or ~/.cache. Created with mode 0700.
+    """
+    global lib_cache_dir
+    lib_cache_dir = Path(directory) if directory is not None else _default_cache_dir()
+
 
 def add_lib_path(path: str | Path):
     """
@@ -35,13 +93,17 @@ def add_lib_path(path: str | Path):
     path = Path(path).resolve()
     if path not in lib_search_paths:
         lib_search_paths.insert(0, path)  # Add to front for priority
+        _invalidate_lib_caches()
 
 
 def clear_lib_paths():
-    """Clear all custom library search paths."""
+    """Clear all custom library search paths and re-detect the KiCad install."""
     lib_search_paths.clear()
+    _invalidate_lib_caches()
+    find_kicad_symbols.cache_clear()
 
 
+@functools.lru_cache(maxsize=None)
 def find_kicad_symbols() -> Path | None:
     """
     Find KiCad symbol library directory.
@@ -50,6 +112,9 @@ def find_kicad_symbols() -> Path | None:
     1. KICAD_SYMBOL_DIR environment variable
     2. Common installation paths
     
+    The result is memoized, as library lookups call this often;
+    clear_lib_paths() (or find_kicad_symbols.cache_clear()) re-detects it.
+    
     Returns:
         Path to symbol directory, or None if not found.
     """
@@ -82,7 +147,7 @@ def find_kicad_symbols() -> Path | None:
     return None
 
 
-def auto_discover_libs() -> bool:
+def auto_discover_libs(enable_prefetch: bool = True) -> bool:
     """
     Automatically discover and add KiCad symbol library path.
     
@@ -90,6 +155,11 @@ def auto_discover_libs() -> bool:
     to lib_search_paths. Call this at startup to enable automatic
     library resolution.
     
+    Args:
+        enable_prefetch: Also start loading the commonly used libraries
+            (see _COMMON_LIBS) in background threads, so they are ready
+            by the time the first parts are created.
+    
     Returns:
         True if a library path was found and added, False otherwise.
         
@@ -101,6 +171,9 @@ def auto_discover_libs() -> bool:
     if symbols_dir:
         if symbols_dir not in lib_search_paths:
             lib_search_paths.append(symbols_dir)
+            _invalidate_lib_caches()
+        if enable_prefetch:
+            _prefetch_libraries(_COMMON_LIBS)
         return True
     return False
 
@@ -109,7 +182,8 @@ def search_parts(pattern: str, library: str | None = None, max_results: int = 20
     """
     Search for parts matching a pattern across libraries.
     
-    Performs case-insensitive substring matching on symbol names.
+    Performs case-insensitive substring matching on symbol names. Only
+    each library's name index is read; no symbol is parsed.
     
     Args:
         pattern: Search pattern (substring match).
@@ -123,8 +197,6 @@ def search_parts(pattern: str, library: str | None = None, max_results: int = 20
         results = search_parts('555')  # Find all 555 timer variants
         results = search_parts('LM78', library='Regulator_Linear')
     """
-    import re
-    
     pattern_lower = pattern.lower()
     results = []
     
@@ -164,9 +236,38 @@ def list_libraries(symbols_dir: Path | None = None) -> list[str]:
     if symbols_dir is None:
         return []
     
-    return sorted([
-        f.stem for f in symbols_dir.glob("*.kicad_sym")
-    ])
+    return sorted(name[:-len(".kicad_sym")] for name in _scan_dir(symbols_dir))
+
+
+# Directory -> (mtime_ns, names of the .kicad_sym files in it)
+_dir_cache: dict[Path, tuple[int, frozenset[str]]] = {}
+
+
+def _scan_dir(directory: Path) -> frozenset[str]:
+    """
+    Names of the .kicad_sym files in a directory, from one scandir.
+    
+    Listings are cached until the directory's mtime changes, which it
+    does whenever a file is added, removed or renamed. A missing
+    directory has no libraries.
+    """
+    try:
+        mtime = directory.stat().st_mtime_ns
+    except OSError:
+        return frozenset()
+    cached = _dir_cache.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with os.scandir(directory) as entries:
+            names = frozenset(
+                entry.name for entry in entries
+                if entry.name.endswith(".kicad_sym") and entry.is_file()
+            )
+    except OSError:
+        return frozenset()
+    _dir_cache[directory] = (mtime, names)
+    return names
 
 
 class SymbolLibrary:
@@ -187,6 +288,13 @@ class SymbolLibrary:
         self.name = name
         self._path = path
         self._symbols: dict[str, Symbol] = {}
+        # Symbol name -> (byte offset, length) of its node in the file.
+        # Symbols are parsed from these ranges the first time they're used.
+        self._index: dict[str, tuple[int, int]] = {}
+        # Derived symbol name -> symbol merged with its `extends` parent
+        self._resolved: dict[str, Symbol] = {}
+        # (size, mtime_ns) of the file when it was indexed
+        self._stamp: tuple[int, int] | None = None
         self._loaded = False
     
     @property
@@ -195,25 +303,30 @@ class SymbolLibrary:
         if self._path:
             return self._path
         
+        file_name = f"{self.name}.kicad_sym"
+        
         # Check custom search paths first
         for search_dir in lib_search_paths:
-            lib_path = search_dir / f"{self.name}.kicad_sym"
-            if lib_path.exists():
-                self._path = lib_path
-                return lib_path
+            if file_name in _scan_dir(search_dir):
+                self._path = search_dir / file_name
+                return self._path
         
         # Fall back to KiCad installation
         symbols_dir = find_kicad_symbols()
-        if symbols_dir:
-            lib_path = symbols_dir / f"{self.name}.kicad_sym"
-            if lib_path.exists():
-                self._path = lib_path
-                return lib_path
+        if symbols_dir and file_name in _scan_dir(symbols_dir):
+            self._path = symbols_dir / file_name
+            return self._path
         
         return None
     
     def _load(self):
-        """Load symbols from file."""
+        """
+        Index the symbols in the library file.
+        
+        Only the location of each symbol is recorded here; see _symbol().
+        The index, and any symbols parsed in full by _parse_all(), are
+        also cached on disk if enable_lib_cache() was called.
+        """
         if self._loaded:
             return
         
@@ -221,50 +334,83 @@ class SymbolLibrary:
         if path is None:
             raise FileNotFoundError(f"Symbol library '{self.name}' not found")
         
-        data = parse_file(path)
-        if not data:
+        # Taken before reading, so a change made while indexing shows up
+        # as a mismatch later rather than going unnoticed
+        self._stamp = _file_stamp(path.stat())
+        cache_path = _lib_cache_path(path)
+        cached = _read_lib_cache(cache_path, self._stamp)
+        if cached is not None:
+            self._index, self._symbols = cached
+            self._loaded = True
             return
         
-        root = data[0]
-        if root[0] != "kicad_symbol_lib":
-            raise ValueError(f"Invalid symbol library file: {path}")
-        
-        for item in root:
-            if isinstance(item, list) and item[0] == "symbol":
-                symbol = Symbol.from_sexpr(item)
-                self._symbols[symbol.name] = symbol
-        
+        self._index = _index_symbols(path)
         self._loaded = True
+        _write_lib_cache(cache_path, self._stamp, (self._index, self._symbols))
+    
+    def _symbol(self, name: str) -> Symbol | None:
+        """Get a symbol as stored in the file, parsing it on first use."""
+        symbol = self._symbols.get(name)
+        if symbol is None:
+            span = self._index.get(name)
+            if span is None:
+                return None
+            start, length = span
+            with open(self.path, "rb") as f:
+                if _file_stamp(os.fstat(f.fileno())) != self._stamp:
+                    # Edited since indexing: the offsets no longer apply
+                    self._reindex()
+                    return self._symbol(name)
+                f.seek(start)
+                text = f.read(length).decode("utf-8")
+            symbol = self._symbols[name] = Symbol.from_sexpr(parse(text)[0])
+        return symbol
+    
+    def _reindex(self):
+        """Drop everything read from the file and index it again."""
+        self._symbols = {}
+        self._index = {}
+        self._resolved = {}
+        self._loaded = False
+        self._load()
+    
+    def _parse_all(self):
+        """Parse every symbol in the library, caching the result on disk if enabled."""
+        self._load()
+        if len(self._symbols) == len(self._index):
+            return
+        
+        # One read of the file for all remaining symbols
+        with open(self.path, "rb") as f:
+            if _file_stamp(os.fstat(f.fileno())) != self._stamp:
+                self._reindex()
+                return self._parse_all()
+            data = f.read()
+        symbols = self._symbols
+        from_sexpr = Symbol.from_sexpr
+        for name, (start, length) in self._index.items():
+            if name not in symbols:
+                symbols[name] = from_sexpr(parse(data[start:start + length].decode("utf-8"))[0])
+        _write_lib_cache(_lib_cache_path(self.path), self._stamp, (self._index, self._symbols))
     
     def get(self, name: str) -> Symbol | None:
         """Get a symbol by name, resolving inheritance if needed."""
-        self._load()
-        symbol = self._symbols.get(name)
+        if not self._loaded:
+            self._load()
+        symbol = self._symbol(name)
         if symbol is None:
             return None
         
-        # Resolve inheritance (extends)
+        # Resolve inheritance (extends), once per derived symbol
         if symbol.extends:
-            import copy
-            # Recursively get base symbol
+            resolved = self._resolved.get(name)
+            if resolved is not None:
+                return resolved
             parent = self.get(symbol.extends)
             if parent:
-                # Create a merged copy
-                # 1. Start with parent
-                merged = copy.deepcopy(parent)
-                # 2. Update metadata
-                merged.name = symbol.name
-                merged.extends = symbol.extends
-                # 3. Update properties from derived
-                merged.properties.update(symbol.properties)
-                # 4. In KiCad 6+, if derived has pins/graphics, they usually override.
-                # However, derived symbols often just have 'extends' and properties.
-                if symbol.pins:
-                    merged.pins = copy.deepcopy(symbol.pins)
-                if symbol.graphics:
-                    merged.graphics = copy.deepcopy(symbol.graphics)
-                return merged
-                
+                resolved = self._resolved[name] = parent.shallow_derive(symbol)
+                return resolved
+        
         return symbol
     
     def __getitem__(self, name: str) -> Symbol:
@@ -276,39 +422,241 @@ class SymbolLibrary:
     
     def __contains__(self, name: str) -> bool:
         """Check if a symbol exists in the library."""
-        self._load()
-        return name in self._symbols
+        if not self._loaded:
+            self._load()
+        return name in self._index
     
     def __iter__(self) -> Iterator[str]:
         """Iterate over symbol names."""
-        self._load()
-        return iter(self._symbols)
+        if not self._loaded:
+            self._load()
+        return iter(self._index)
     
     def symbols(self) -> list[Symbol]:
         """Get all symbols in the library."""
-        self._load()
-        return list(self._symbols.values())
+        self._parse_all()
+        return [self._symbols[name] for name in self._index]
+
+
+def _index_symbols(path: Path) -> dict[str, tuple[int, int]]:
+    """
+    Find the byte range of each top-level symbol in a .kicad_sym file.
+    
+    Only parens and quoted strings are scanned, so this is much cheaper
+    than parsing the whole library.
+    
+    Raises:
+        ValueError: If the file is not a symbol library.
+        ParseError: If the parentheses are unbalanced.
+    """
+    data = path.read_bytes()
+    if not data.strip():
+        return {}
+    if not _LIB_HEAD_RE.match(data):
+        raise ValueError(f"Invalid symbol library file: {path}")
+    
+    index = {}
+    depth = 0
+    start = 0
+    # Nothing after the last paren can be a token; stopping there also
+    # keeps finditer from retrying the skip at every byte of trailing text
+    end = max(data.rfind(b"("), data.rfind(b")")) + 1
+    for match in _INDEX_TOKEN_RE.finditer(data, 0, end):
+        if match.lastindex == 1:  # (
+            depth += 1
+            if depth == 2:
+                start = match.start(1)
+        elif match.lastindex == 2:  # )
+            if depth == 2:
+                head = _SYMBOL_HEAD_RE.match(data, start)
+                if head is not None:
+                    name = head.group(1).decode("utf-8")
+                    if name.startswith('"'):
+                        name = _unescape_string(name)
+                    index[sys.intern(name)] = (start, match.end() - start)
+            elif depth == 0:
+                raise ParseError("Unexpected closing parenthesis", match.start(2))
+            depth -= 1
+    
+    if depth:
+        raise ParseError("Unclosed parenthesis", len(data))
+    return index
+
+
+def _file_stamp(st: os.stat_result) -> tuple[int, int]:
+    """(size, mtime_ns) of a stat result, to tell whether a file changed."""
+    return st.st_size, st.st_mtime_ns
+
+
+def _lib_cache_path(path: Path) -> Path | None:
+    """
+    Disk cache file for a library, keyed by its resolved path.
+    
+    The file's size and mtime are stored inside the entry instead, so an
+    edited library overwrites its old entry rather than adding another.
+    """
+    if lib_cache_dir is None:
+        return None
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()
+    return lib_cache_dir / f"{path.stem}-{digest}.pkl"
+
+
+def _is_private(st: os.stat_result, others_mask: int) -> bool:
+    """
+    True if a stat result is owned by this user with none of `others_mask` set.
+    
+    Without POSIX ownership (Windows) the cache lives in the user's own
+    profile, so there is nothing to check.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & others_mask
+
+
+def _read_lib_cache(
+    cache_path: Path | None,
+    stamp: tuple[int, int],
+) -> tuple[dict[str, tuple[int, int]], dict[str, Symbol]] | None:
+    """
+    Load a pickled (index, symbols) pair written for the library as of `stamp`.
+    
+    Returns None on a miss, an unreadable entry, or one written by another
+    cache version or for a different revision of the file.
+    """
+    if cache_path is None:
+        return None
+    try:
+        if not _is_private(cache_path.parent.stat(), 0o077):
+            return None
+        with open(cache_path, "rb") as f:
+            if not _is_private(os.fstat(f.fileno()), 0o022):
+                return None
+            version, entry_stamp, entry = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated or incompatible entry: parse the library instead
+        return None
+    if version != _LIB_CACHE_VERSION or entry_stamp != stamp:
+        return None
+    return entry
+
+
+def _write_lib_cache(
+    cache_path: Path | None,
+    stamp: tuple[int, int],
+    entry: tuple[dict[str, tuple[int, int]], dict[str, Symbol]],
+):
+    """Pickle a library's (index, symbols); the cache is best-effort and never raises."""
+    if cache_path is None:
+        return
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private(cache_path.parent.stat(), 0o077):
+            return  # Entries here could never be trusted again anyway
+        with open(tmp_path, "wb") as f:
+            pickle.dump((_LIB_CACHE_VERSION, stamp, entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)  # Atomic, so readers never see partial files
+    except (OSError, pickle.PicklingError, RecursionError):
+        # Don't leave a half-written temp file behind (e.g. disk full)
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
 
 
 # Cache of loaded libraries
 _library_cache: dict[str, SymbolLibrary] = {}
 
+# lib_search_paths as of the last cache invalidation
+_cached_lib_paths: tuple[Path, ...] = ()
+
+# Libraries most designs use, loaded ahead of time by auto_discover_libs()
+_COMMON_LIBS = ("Device", "Connector", "power", "Amplifier_Operational", "Regulator_Linear")
+
+# Library name -> background load still to be waited for by get_library()
+_prefetches: dict[str, Future] = {}
+
+
+def _prefetch_libraries(names: Iterable[str]):
+    """Start loading libraries in background threads."""
+    pending = [name for name in names if name not in _library_cache]
+    if not pending:
+        return
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sform_skidl-libs")
+    for name in pending:
+        lib = _library_cache[name] = SymbolLibrary(name)
+        _prefetches[name] = executor.submit(lib._load)
+    executor.shutdown(wait=False)  # Workers exit once the loads finish
+
+
+def _invalidate_lib_caches():
+    """Drop everything that depends on lib_search_paths."""
+    global _cached_lib_paths
+    _cached_lib_paths = tuple(lib_search_paths)
+    _library_cache.clear()
+    _prefetches.clear()
+    _resolve_symbol.cache_clear()
+
+
+def _sync_lib_paths():
+    """Invalidate the caches if lib_search_paths was edited in place."""
+    if tuple(lib_search_paths) != _cached_lib_paths:
+        _invalidate_lib_caches()
+
 
 def get_library(name: str) -> SymbolLibrary:
     """
     Get a symbol library by name (cached).
     
+    Libraries are kept for the life of the process, and parsed contents
+    are also cached on disk once enable_lib_cache() has been called.
+    Changing the search paths drops the in-process cache.
+    
     Args:
         name: Library name (e.g., "Device").
         
     Returns:
         SymbolLibrary instance.
     """
+    _sync_lib_paths()
+    future = _prefetches.get(name)
+    if future is not None:
+        # Left in place until done so concurrent callers wait on the same
+        # load. Errors (e.g. a missing library) are raised again by the
+        # library's own _load() when it's used
+        wait([future])
+        _prefetches.pop(name, None)
     if name not in _library_cache:
         _library_cache[name] = SymbolLibrary(name)
     return _library_cache[name]
 
 
+def resolve_symbol(lib: str, name: str) -> Symbol | None:
+    """
+    Look up a symbol by library and name (memoized).
+    
+    Repeated parts of the same type share one lookup, including misses
+    for libraries that cannot be found. The cache is cleared whenever the
+    library search paths change, including edits made to
+    lib_search_paths directly.
+    
+    Returns:
+        The Symbol, or None if the library or symbol is not available.
+    """
+    _sync_lib_paths()
+    return _resolve_symbol(lib, name)
+
+
+@functools.lru_cache(maxsize=512)
+def _resolve_symbol(lib: str, name: str) -> Symbol | None:
+    try:
+        return get_library(lib).get(name)
+    except FileNotFoundError:
+        return None
+
+
 def read_symbol_library(path: Path | str) -> dict[str, Symbol]:
     """
     Read all symbols from a .kicad_sym file.
@@ -321,8 +669,8 @@ def read_symbol_library(path: Path | str) -> dict[str, Symbol]:
     """
     lib = SymbolLibrary("", Path(path))
     lib._path = Path(path)
-    lib._load()
-    return lib._symbols.copy()
+    lib._parse_all()
+    return {name: lib._symbols[name] for name in lib._index}
 
 
 def write_symbol_library(
@@ -9,7 +9,11 @@ Provides intelligent component placement based on:
 
 from __future__ import annotations
 
+import functools
+import sys
+from collections import deque
 from dataclasses import dataclass, field
+from operator import itemgetter
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -18,7 +22,17 @@ if TYPE_CHECKING:
     from .models.circuit import Circuit
 
 
-@dataclass
+# Ref prefixes of connectors, which layout pushes to the sheet edges
+_CONNECTOR_PREFIXES = frozenset({'J', 'P', 'CONN'})
+
+
+@functools.lru_cache(maxsize=4096)
+def _ref_prefix(ref: str) -> str:
+    """Letters of a reference designator, e.g. "R" for "R12" (memoized, interned)."""
+    return sys.intern(''.join(c for c in ref if c.isalpha()))
+
+
+@dataclass(slots=True)
 class LayoutConfig:
     """Configuration for schematic layout."""
     grid_size: float = 2.54  # mm (100 mil)
@@ -28,7 +42,7 @@ class LayoutConfig:
     power_margin: float = 20.0  # mm margin for power rails
 
 
-@dataclass
+@dataclass(slots=True)
 class PartPlacement:
     """Placement information for a part."""
     part: "Part"
@@ -105,48 +119,46 @@ class SmartLayout:
         output_parts = set()
         
         for part in self.circuit.parts:
-            has_input = any(p.pin_type == PinType.INPUT for p in part.pins)
-            has_output = any(p.pin_type == PinType.OUTPUT for p in part.pins)
-            has_power = any(p.pin_type == PinType.POWER_IN for p in part.pins)
+            pin_types = {p._pin_type for p in part._pin_list}
+            has_input = PinType.INPUT in pin_types
+            has_output = PinType.OUTPUT in pin_types
             
             if has_input and not has_output:
                 input_parts.add(part.ref)
             elif has_output and not has_input:
                 output_parts.add(part.ref)
         
-        # BFS to assign columns
-        visited = set()
-        queue = []
+        # BFS to assign columns, starting with parts connected to
+        # "input-like" nets, or the first part if there are no clear inputs
+        starts = [part for part in self.circuit.parts if part.ref in input_parts]
+        if not starts:
+            starts = self.circuit.parts[:1]
         
-        # Start with parts connected to "input-like" nets
-        for part in self.circuit.parts:
-            if part.ref in input_parts:
-                columns[part.ref] = 0
-                queue.append(part)
-                visited.add(part.ref)
-        
-        # If no clear inputs, start with first part
-        if not queue and self.circuit.parts:
-            part = self.circuit.parts[0]
-            columns[part.ref] = 0
-            queue.append(part)
-            visited.add(part.ref)
+        columns.update((part.ref, 0) for part in starts)
+        visited = {part.ref for part in starts}
+        queue = deque(starts)
         
-        # BFS to propagate columns
+        # BFS to propagate columns. Each net is walked once, from the first
+        # part to reach it: parts dequeued later sit in the same or a later
+        # column, so walking it again could not give anything a lower one.
+        expanded_nets = set()
         while queue:
-            current = queue.pop(0)
-            current_col = columns.get(current.ref, 0)
+            current = queue.popleft()
+            next_col = columns.get(current.ref, 0) + 1
             
             # Find connected parts through nets
-            for pin in current.pins:
-                if pin.net:
-                    for other_pin in pin.net.pins:
-                        if hasattr(other_pin, 'part') and other_pin.part:
-                            other_ref = other_pin.part.ref
-                            if other_ref not in visited:
-                                visited.add(other_ref)
-                                columns[other_ref] = current_col + 1
-                                queue.append(other_pin.part)
+            for pin in current._pin_list:
+                net = pin._net
+                if net is None or id(net) in expanded_nets:
+                    continue
+                expanded_nets.add(id(net))
+                # Walk the net's own pin list; Net.pins would copy it
+                for other_pin in net._pins:
+                    other = other_pin._part
+                    if other and other.ref not in visited:
+                        visited.add(other.ref)
+                        columns[other.ref] = next_col
+                        queue.append(other)
         
         # Assign remaining parts to middle column
         max_col = max(columns.values()) if columns else 0
@@ -172,8 +184,7 @@ class SmartLayout:
                 groups[part.ref] = part._group
             else:
                 # Default group by ref prefix
-                prefix = ''.join(c for c in part.ref if c.isalpha())
-                groups[part.ref] = prefix or 'misc'
+                groups[part.ref] = _ref_prefix(part.ref) or 'misc'
         
         return groups
     
@@ -194,12 +205,19 @@ class SmartLayout:
         # Sort columns
         sorted_cols = sorted(by_column.keys())
         
+        # Per-column constants
+        spacing_y = cfg.part_spacing_y
+        group_gap = cfg.group_spacing - spacing_y
+        last_col = len(sorted_cols) - 1
+        placements = self.placements
+        
         # Assign positions
         for col_idx, col in enumerate(sorted_cols):
-            parts_in_col = by_column[col]
-            
-            # Sort by group within column
-            parts_in_col.sort(key=lambda p: groups.get(p.ref, ''))
+            # Sort by group within column, looking each group up once
+            grouped = sorted(
+                ((groups.get(p.ref, ''), p) for p in by_column[col]),
+                key=itemgetter(0),
+            )
             
             # Determine X position
             x = col_idx * cfg.part_spacing_x + cfg.power_margin
@@ -212,40 +230,30 @@ class SmartLayout:
             # Current flow puts inputs at 0. Outputs at Max.
             # But we want to ensure separation if they are mixed with other components.
             # Let's add a "Connector Zone" margin?
-            
-            pass
+            if col_idx == 0:
+                conn_x = cfg.power_margin / 2  # Far Left
+            elif col_idx == last_col:
+                conn_x = x + cfg.part_spacing_x  # Far Right (push out a bit more)
+            else:
+                conn_x = x
             
             current_group = None
             y_offset = cfg.power_margin
             
-            for part in parts_in_col:
-                group = groups.get(part.ref, '')
-                
-                # Check for Connector
-                ref_prefix = ''.join(c for c in part.ref if c.isalpha())
-                is_conn = ref_prefix in ('J', 'P', 'CONN')
-                
-                final_x = x
-                if is_conn:
-                     if col_idx == 0:
-                         final_x = cfg.power_margin / 2 # Far Left
-                     elif col_idx == len(sorted_cols) - 1:
-                         # Far Right (push out a bit more)
-                         final_x = x + cfg.part_spacing_x 
-                
+            for group, part in grouped:
                 # Add extra spacing between groups
                 if current_group is not None and group != current_group:
-                    y_offset += cfg.group_spacing - cfg.part_spacing_y
+                    y_offset += group_gap
                 
-                self.placements[part.ref] = PartPlacement(
+                placements[part.ref] = PartPlacement(
                     part=part,
-                    x=final_x,
+                    x=conn_x if _ref_prefix(part.ref) in _CONNECTOR_PREFIXES else x,
                     y=y_offset,
                     column=col,
                     group=group,
                 )
                 
-                y_offset += cfg.part_spacing_y
+                y_offset += spacing_y
                 current_group = group
     
     def get_positions(self) -> dict[str, tuple[float, float]]:
@@ -8,7 +8,7 @@ and element-wise connection.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Iterator, Union
+from typing import TYPE_CHECKING, ClassVar, Iterator, Union
 import re
 
 if TYPE_CHECKING:
@@ -18,7 +18,7 @@ if TYPE_CHECKING:
 from .net import Net
 
 
-@dataclass
+@dataclass(slots=True)
 class Bus:
     """
     Represents a group of related nets (a bus).
@@ -38,7 +38,7 @@ class Bus:
     _nets: list[Net] = field(default_factory=list, repr=False)
     
     # Class-level counter for anonymous buses
-    _counter: int = 0
+    _counter: ClassVar[int] = 0
     
     def __init__(
         self, 
@@ -60,23 +60,18 @@ class Bus:
             name = f"Bus{Bus._counter}"
         
         self.name = name
-        self._nets = []
         
         # Create nets based on width
-        if width > 0:
-            for i in range(width):
-                self._nets.append(Net(f"{name}{i}"))
+        self._nets = nets = [Net(f"{name}{i}") for i in range(width)]
         
         # Add any additional items from args
         for item in args:
             if isinstance(item, Net):
-                self._nets.append(item)
+                nets.append(item)
             elif isinstance(item, Bus):
-                self._nets.extend(item._nets)
+                nets.extend(item._nets)
             elif hasattr(item, '__iter__'):
-                for sub in item:
-                    if isinstance(sub, Net):
-                        self._nets.append(sub)
+                nets.extend(sub for sub in item if isinstance(sub, Net))
     
     @property
     def width(self) -> int:
@@ -139,9 +134,7 @@ class Bus:
                 )
             for my_net, other_net in zip(self._nets, other._nets):
                 # Merge nets by moving pins from other_net to my_net
-                for pin in list(other_net.pins):  # Copy list to allow modification
-                    pin.disconnect()  # Disconnect from old net
-                    pin.connect(my_net)  # Connect to new net
+                my_net._absorb(other_net)
             return self
         
         elif isinstance(other, Net):
@@ -189,6 +182,8 @@ class PinGroup:
     Supports += operator for element-wise connection.
     """
     
+    __slots__ = ("_pins", "_part")
+    
     def __init__(self, pins: list, part=None):
         """
         Initialize pin group.
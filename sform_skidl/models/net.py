@@ -6,16 +6,25 @@ Tracks pin connections and supports SKiDL-style connection syntax.
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 import uuid
 
+from .pin import Pin, PinType
+# part.py imports this module (via bus.py) before Part is defined, so bind
+# the module and look Part up when an operator runs
+from . import part as _part_mod
+
 if TYPE_CHECKING:
-    from .pin import Pin
     from .part import Part
 
 
-@dataclass
+# Pin types that drive a net
+_DRIVER_TYPES = frozenset({PinType.OUTPUT, PinType.POWER_OUT})
+
+
+@dataclass(slots=True, eq=False)
 class Net:
     """
     Represents an electrical net connecting multiple pins.
@@ -30,16 +39,32 @@ class Net:
     """
     name: str = ""
     _pins: list[Pin] = field(default_factory=list, repr=False)
-    _uuid: str = field(default_factory=lambda: str(uuid.uuid4()), repr=False)
+    # id() of every pin in _pins, for O(1) membership on large nets
+    _pin_ids: set[int] = field(default_factory=set, repr=False, compare=False)
+    # Generated on first access through .uuid; most nets never need one
+    _uuid: str | None = field(default=None, repr=False)
+    # PinType -> number of connected pins of that type, kept in step with
+    # _pins so rule checks don't have to walk the pin list
+    _type_counts: Counter = field(default_factory=Counter, repr=False, compare=False)
+    # Last drive_pin result, recomputed only after the pins change
+    _drive_pin: Pin | None = field(default=None, init=False, repr=False, compare=False)
+    _drive_stale: bool = field(default=True, init=False, repr=False, compare=False)
     
     # Class-level net counter for auto-naming
-    _counter: int = 0
+    _counter: ClassVar[int] = 0
     
     def __post_init__(self):
         if not self.name:
             Net._counter += 1
             self.name = f"Net{Net._counter}"
     
+    @property
+    def uuid(self) -> str:
+        """Stable UUID, generated on first use."""
+        if self._uuid is None:
+            self._uuid = str(uuid.uuid4())
+        return self._uuid
+    
     @property
     def pins(self) -> list[Pin]:
         """List of connected pins (read-only)."""
@@ -48,28 +73,76 @@ class Net:
     @property
     def is_power(self) -> bool:
         """True if net contains power pins."""
-        return any(p.is_power for p in self._pins)
+        counts = self._type_counts
+        return counts[PinType.POWER_IN] > 0 or counts[PinType.POWER_OUT] > 0
     
     @property
     def drive_pin(self) -> Pin | None:
         """Find the pin driving this net (Output or PowerOut)."""
-        from .pin import PinType
-        drivers = [p for p in self._pins if p.pin_type in (PinType.OUTPUT, PinType.POWER_OUT)]
-        if drivers:
-            return drivers[0]
-        # Fallback to bidirectional
-        bidir = [p for p in self._pins if p.pin_type == PinType.BIDIRECTIONAL]
-        return bidir[0] if bidir else None
+        if not self._drive_stale:
+            return self._drive_pin
+        
+        # First output/power-out pin, falling back to the first bidirectional
+        drive = None
+        bidir = PinType.BIDIRECTIONAL
+        for p in self._pins:
+            pin_type = p._pin_type
+            if pin_type in _DRIVER_TYPES:
+                drive = p
+                break
+            if drive is None and pin_type is bidir:
+                drive = p
+        
+        self._drive_pin = drive
+        self._drive_stale = False
+        return drive
     
     def _add_pin(self, pin: Pin):
         """Internal: add pin to this net."""
-        if pin not in self._pins:
+        if id(pin) not in self._pin_ids:
+            self._pin_ids.add(id(pin))
             self._pins.append(pin)
+            self._type_counts[pin._pin_type] += 1
+            self._drive_stale = True
     
     def _remove_pin(self, pin: Pin):
         """Internal: remove pin from this net."""
-        if pin in self._pins:
+        if id(pin) in self._pin_ids:
+            self._pin_ids.discard(id(pin))
             self._pins.remove(pin)
+            self._type_counts[pin._pin_type] -= 1
+            self._drive_stale = True
+    
+    def _retype_pin(self, old: PinType, new: PinType):
+        """Internal: a connected pin's type changed from `old` to `new`."""
+        counts = self._type_counts
+        counts[old] -= 1
+        counts[new] += 1
+        self._drive_stale = True
+    
+    def _absorb(self, other: Net):
+        """Internal: move every pin of `other` onto this net in one pass."""
+        if other is self:
+            return
+        for pin in other._pins:
+            pin._net = self
+        if self._pins:
+            self._pins.extend(other._pins)
+            self._pin_ids.update(other._pin_ids)
+            self._type_counts.update(other._type_counts)
+            other._pins.clear()
+            other._pin_ids.clear()
+        else:
+            # Nothing here yet: take over the other net's pins and counts
+            self._pins, other._pins = other._pins, self._pins
+            self._pin_ids, other._pin_ids = other._pin_ids, self._pin_ids
+            self._type_counts, other._type_counts = other._type_counts, self._type_counts
+        other._type_counts.clear()
+        self._drive_stale = other._drive_stale = True
+    
+    def __contains__(self, pin: Pin) -> bool:
+        """Check if pin is connected to this net."""
+        return id(pin) in self._pin_ids
     
     def __iadd__(self, other) -> Net:
         """
@@ -80,15 +153,25 @@ class Net:
             net += [pin1, pin2]
             net += part  # connects all pins
         """
-        from .pin import Pin
-        from .part import Part
+        Part = _part_mod.Part
         
         if isinstance(other, Pin):
             other.connect(self)
         elif isinstance(other, Part):
             # Connect all pins of the part
-            for pin in other._pins.values():
+            for pin in other._pin_list:
                 pin.connect(self)
+        elif isinstance(other, (list, tuple)):
+            # Bulk connect: handle the common item types inline rather than
+            # re-entering the full dispatch for every element
+            for item in other:
+                if isinstance(item, Pin):
+                    item.connect(self)
+                elif isinstance(item, Part):
+                    for pin in item._pin_list:
+                        pin.connect(self)
+                else:
+                    self.__iadd__(item)
         elif hasattr(other, "__iter__"):
             for item in other:
                 self.__iadd__(item)
@@ -107,12 +190,11 @@ class Net:
         Example:
             vin & r1 & vout & r2 & gnd  # Voltage divider
         """
-        from .part import Part
-        from .pin import Pin
+        Part = _part_mod.Part
         
         if isinstance(other, Part):
             # For series connection, connect this net to first pin
-            pins = list(other._pins.values())
+            pins = list(other._pin_list)
             if pins:
                 pins[0].connect(self)
             # Return a _ChainedPart to track which pin to use next
@@ -144,14 +226,13 @@ class Net:
         Example:
             gnd | r1[2] | c1[2]  # Connect multiple items to GND
         """
-        from .pin import Pin
-        from .part import Part
+        Part = _part_mod.Part
         
         if isinstance(other, Pin):
             other.connect(self)
         elif isinstance(other, Part):
             # Connect all pins of part to this net
-            for pin in other._pins.values():
+            for pin in other._pin_list:
                 pin.connect(self)
         elif isinstance(other, Net):
             # Merge other net into this one
@@ -180,8 +261,7 @@ class _ChainedPart:
     
     def __and__(self, other) -> "Net":
         """Continue the chain from the exit pin."""
-        from .part import Part
-        from .pin import Pin
+        Part = _part_mod.Part
         
         if isinstance(other, Net):
             # Connect exit pin to the target net
@@ -189,7 +269,7 @@ class _ChainedPart:
             return other
         elif isinstance(other, Part):
             # Create connection through this part
-            pins = list(other._pins.values())
+            pins = list(other._pin_list)
             if pins:
                 # Connect our exit pin to the next part's first pin via a new net
                 intermediate = Net()
@@ -210,10 +290,6 @@ class _ChainedPart:
     def __rand__(self, other):
         return self.__and__(other)
     
-    def __contains__(self, pin: Pin) -> bool:
-        """Check if pin is connected to this net."""
-        return pin in self._pins
-    
     def __len__(self) -> int:
         """Number of connected pins."""
         return len(self._pins)
@@ -6,11 +6,14 @@ High-level component abstraction with SKiDL-compatible API.
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
+import functools
+import re
 import uuid
-import copy
 
+from .bus import PinGroup
 from .pin import Pin, PinType
 from .symbol import Symbol
 
@@ -22,8 +25,29 @@ if TYPE_CHECKING:
 TEMPLATE = "template"
 NETLIST = "netlist"
 
+# Reference prefixes for common part names, used when there is no symbol
+_REF_PREFIXES = {
+    "R": "R", "C": "C", "L": "L",
+    "D": "D", "LED": "D",
+    "Q": "Q", "MOSFET": "Q",
+    "U": "U", "IC": "U",
+    "J": "J", "P": "P",
+    "SW": "SW", "F": "F",
+}
 
-@dataclass
+# Pin keys containing any of these are tried as regex patterns
+_METACHAR_RE = re.compile(r'[*+?\[\]()|^$.]')
+# One end of a range key such as "D0:D7"
+_RANGE_RE = re.compile(r'^([A-Za-z_]*)(\d+)$')
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_key(key: str) -> re.Pattern:
+    """Compile a pin-pattern key (memoized; raises re.error like re.compile)."""
+    return re.compile(key)
+
+
+@dataclass(slots=True, eq=False)
 class Part:
     """
     Represents a circuit component (part).
@@ -54,56 +78,49 @@ class Part:
     
     # Internal state
     _symbol: Symbol | None = field(default=None, repr=False)
-    _pins: dict[str, Pin] = field(default_factory=dict, repr=False)
-    _uuid: str = field(default_factory=lambda: str(uuid.uuid4()), repr=False)
+    # Each pin once, in definition order, plus lookups by number and name
+    _pin_list: list[Pin] = field(default_factory=list, repr=False)
+    _by_number: dict[str, Pin] = field(default_factory=dict, repr=False)
+    _by_name: dict[str, Pin] = field(default_factory=dict, repr=False)
+    # Generated on first access through .uuid
+    _uuid: str | None = field(default=None, repr=False)
     
-    # Class-level reference counters
-    _ref_counters: dict[str, int] = field(default_factory=dict, repr=False, init=False)
+    # Set after construction: subcircuit path and compat group name
+    hierarchy: str = field(default="", init=False, repr=False, compare=False)
+    _group: str | None = field(default=None, init=False, repr=False, compare=False)
+    
+    # Class-level reference counters, per ref prefix
+    _counters: ClassVar[defaultdict[str, int]] = defaultdict(int)
     
     def __post_init__(self):
         """Initialize part with symbol and pins."""
         # Capture hierarchy context
         try:
-            from ..hierarchy import get_hierarchy_prefix
-            self.hierarchy = get_hierarchy_prefix().rstrip(".")
+            from ..hierarchy import get_hierarchy_path
+            self.hierarchy = get_hierarchy_path()
         except ImportError:
             self.hierarchy = ""
 
         # Auto-generate reference if not provided
         if not self.ref and self.dest != TEMPLATE:
             prefix = self._get_ref_prefix()
-            if not hasattr(Part, '_counters'):
-                Part._counters = {}
-            Part._counters[prefix] = Part._counters.get(prefix, 0) + 1
-            self.ref = f"{prefix}{Part._counters[prefix]}"
+            counters = Part._counters
+            counters[prefix] += 1
+            self.ref = f"{prefix}{counters[prefix]}"
         
         # Create symbol if not provided
         if self._symbol is None:
             self._symbol = Symbol(name=self.name)
         
-        # Copy pins from symbol
-        for pin in self._symbol.pins:
-            pin_copy = copy.copy(pin)
-            pin_copy._part = self
-            self._pins[pin_copy.number] = pin_copy
-            if pin_copy.name and pin_copy.name != pin_copy.number:
-                self._pins[pin_copy.name] = pin_copy
+        # Instantiate pins from the (possibly shared) symbol's pin definitions
+        for pin_def in self._symbol.pins:
+            self._register_pin(pin_def._instantiate(self))
     
     def _get_ref_prefix(self) -> str:
         """Get reference designator prefix based on part type."""
         if self._symbol:
             return self._symbol.reference
-        
-        # Common prefixes
-        prefixes = {
-            "R": "R", "C": "C", "L": "L",
-            "D": "D", "LED": "D",
-            "Q": "Q", "MOSFET": "Q",
-            "U": "U", "IC": "U",
-            "J": "J", "P": "P",
-            "SW": "SW", "F": "F",
-        }
-        return prefixes.get(self.name.upper(), "U")
+        return _REF_PREFIXES.get(self.name.upper(), "U")
     
     def __getitem__(self, key: str | int) -> "Pin | PinGroup":
         """
@@ -116,12 +133,13 @@ class Part:
             part["A.*"]     # Regex pattern -> PinGroup
             part["D0:D7"]   # Range notation -> PinGroup
         """
-        import re
-        from .bus import PinGroup
-        
         if isinstance(key, int):
             key = str(key)
         
+        # Plain numbers and names can't be a list, range or pattern
+        if key.isalnum():
+            return self._get_single_pin(key)
+        
         # Check for space-separated pin list
         if " " in key:
             pins = [self._get_single_pin(k.strip()) for k in key.split()]
@@ -134,8 +152,8 @@ class Part:
                 # Try to expand range
                 start, end = parts
                 # Extract prefix and numbers
-                match_start = re.match(r'^([A-Za-z_]*)(\d+)$', start)
-                match_end = re.match(r'^([A-Za-z_]*)(\d+)$', end)
+                match_start = _RANGE_RE.match(start)
+                match_end = _RANGE_RE.match(end)
                 if match_start and match_end:
                     prefix_s, num_s = match_start.groups()
                     prefix_e, num_e = match_end.groups()
@@ -143,22 +161,31 @@ class Part:
                         pins = []
                         for i in range(int(num_s), int(num_e) + 1):
                             name = f"{prefix_s}{i}"
-                            if name in self._pins:
-                                pins.append(self._pins[name])
+                            pin = self._find_pin(name)
+                            if pin is not None:
+                                pins.append(pin)
                         if pins:
                             return PinGroup(pins, self)
         
+        # "PREFIX.*" is a prefix match; no need for the regex engine
+        if key.endswith(".*") and key[:-2].isalnum():
+            prefix = key[:-2]
+            matching_pins = [
+                pin for pin in self._pin_list
+                if pin.name.startswith(prefix) or pin.number.startswith(prefix)
+            ]
+            if matching_pins:
+                return PinGroup(matching_pins, self)
+            raise KeyError(f"No pins matching pattern {key!r} in {self.ref}")
+        
         # Check for regex pattern (contains regex metacharacters)
-        if any(c in key for c in ['*', '+', '?', '[', ']', '(', ')', '|', '^', '$', '.']):
+        if _METACHAR_RE.search(key):
             try:
-                pattern = re.compile(key)
-                matching_pins = []
-                seen = set()
-                for pin_key, pin in self._pins.items():
-                    if id(pin) not in seen:
-                        if pattern.match(pin.name) or pattern.match(pin.number):
-                            matching_pins.append(pin)
-                            seen.add(id(pin))
+                pattern = _compile_key(key)
+                matching_pins = [
+                    pin for pin in self._pin_list
+                    if pattern.match(pin.name) or pattern.match(pin.number)
+                ]
                 if matching_pins:
                     return PinGroup(matching_pins, self)
                 raise KeyError(f"No pins matching pattern {key!r} in {self.ref}")
@@ -170,10 +197,34 @@ class Part:
     
     def _get_single_pin(self, key: str) -> "Pin":
         """Get a single pin by exact name or number."""
-        if key in self._pins:
-            return self._pins[key]
+        pin = self._find_pin(key)
+        if pin is not None:
+            return pin
         raise KeyError(f"Part {self.ref} has no pin {key!r}")
     
+    def _find_pin(self, key: str) -> "Pin | None":
+        """Look a pin up by number, then by name."""
+        pin = self._by_number.get(key)
+        if pin is None:
+            pin = self._by_name.get(key)
+        return pin
+    
+    def _register_pin(self, pin: Pin):
+        """Internal: add pin to the pin list and both lookups.
+        
+        A pin with an existing number replaces the old pin in place.
+        """
+        old = self._by_number.get(pin.number)
+        if old is not None:
+            self._pin_list[self._pin_list.index(old)] = pin
+            if self._by_name.get(old.name) is old:
+                del self._by_name[old.name]
+        else:
+            self._pin_list.append(pin)
+        self._by_number[pin.number] = pin
+        if pin.name:
+            self._by_name[pin.name] = pin
+    
     def __call__(self, count: int = 1, **kwargs) -> Part | list[Part]:
         """
         Create one or more instances of this part (template mode).
@@ -226,6 +277,13 @@ class Part:
             _symbol=self._symbol,
         )
     
+    @property
+    def uuid(self) -> str:
+        """Stable UUID, generated on first use."""
+        if self._uuid is None:
+            self._uuid = str(uuid.uuid4())
+        return self._uuid
+
     @property
     def is_template(self) -> bool:
         """True if this part is a template."""
@@ -233,25 +291,21 @@ class Part:
 
     @property
     def pins(self) -> list[Pin]:
-        """List of all unique pins."""
-        seen = set()
-        result = []
-        for pin in self._pins.values():
-            if id(pin) not in seen:
-                seen.add(id(pin))
-                result.append(pin)
-        return result
+        """List of all unique pins (read-only copy)."""
+        return list(self._pin_list)
     
     @property 
     def pin_count(self) -> int:
         """Number of pins."""
-        return len(self.pins)
+        return len(self._pin_list)
     
     def set_pin_count(self, count: int) -> Part:
         """Set number of pins for generic parts like resistors."""
         from .pin import Pin, PinType, PinStyle
         
-        self._pins.clear()
+        self._pin_list.clear()
+        self._by_number.clear()
+        self._by_name.clear()
         
         # Determine positions based on pin count
         # NOTE: KiCad Schematic Coordinate System has +Y going DOWN.
@@ -262,14 +316,14 @@ class Part:
             p1.position = (0.0, -2.54)
             p1.orientation = 270  # Point down (visually Up in symbol editor? check later)
             p1._part = self
-            self._pins['1'] = p1
+            self._register_pin(p1)
             
             # Pin 2 (Bottom) -> Positive Y
             p2 = Pin(number='2', name='2', pin_type=PinType.PASSIVE, style=PinStyle.LINE)
             p2.position = (0.0, 2.54)
             p2.orientation = 90  # Point up
             p2._part = self
-            self._pins['2'] = p2
+            self._register_pin(p2)
         else:
             # Generic fanout for other counts
             for i in range(1, count + 1):
@@ -280,16 +334,14 @@ class Part:
                 # Fan out vertically centered
                 y = (i-1) * 2.54
                 pin.position = (x, y)
-                self._pins[str(i)] = pin
+                self._register_pin(pin)
         
         return self
     
     def add_pin(self, pin: Pin) -> Part:
         """Add a pin to this part."""
         pin._part = self
-        self._pins[pin.number] = pin
-        if pin.name and pin.name != pin.number:
-            self._pins[pin.name] = pin
+        self._register_pin(pin)
         return self
     
     def no_connect(self, *pin_keys) -> Part:
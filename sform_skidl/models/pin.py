@@ -6,7 +6,7 @@ Defines electrical types and graphical styles matching KiCad's pin definitions.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING
 import uuid
@@ -30,6 +30,11 @@ class PinType(Enum):
     OPEN_COLLECTOR = "open_collector"
     OPEN_EMITTER = "open_emitter"
     NO_CONNECT = "no_connect"
+    
+    # Members are singletons compared by identity, so the C-level identity
+    # hash is valid and avoids Enum's Python-level __hash__ in the ERC and
+    # Net type-count lookups.
+    __hash__ = object.__hash__
 
 
 class PinStyle(Enum):
@@ -45,7 +50,7 @@ class PinStyle(Enum):
     NON_LOGIC = "non_logic"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Pin:
     """
     Represents a symbol or part pin.
@@ -61,20 +66,28 @@ class Pin:
     """
     number: str
     name: str = ""
-    pin_type: PinType = PinType.PASSIVE
+    pin_type: InitVar[PinType] = PinType.PASSIVE
     style: PinStyle = PinStyle.LINE
     position: tuple[float, float] = (0.0, 0.0)
     length: float = 2.54
     orientation: int = 0
     
+    # Backing store for the pin_type property
+    _pin_type: PinType = field(init=False)
+    
     # Runtime connections (not serialized)
     _net: Net | None = field(default=None, repr=False, compare=False)
     _part: Part | None = field(default=None, repr=False, compare=False)
-    _uuid: str = field(default_factory=lambda: str(uuid.uuid4()), repr=False)
+    # Generated on first access through .uuid
+    _uuid: str | None = field(default=None, repr=False)
+    _no_connect: bool = field(default=False, repr=False, compare=False)
     
     # Aliases for this pin (alternate names)
     aliases: list[str] = field(default_factory=list, repr=False)
     
+    def __post_init__(self, pin_type: PinType):
+        self._pin_type = pin_type
+    
     def add_alias(self, *names: str) -> "Pin":
         """
         Add alternate names for this pin.
@@ -82,15 +95,53 @@ class Pin:
         Example:
             pin.add_alias('VCC', '3V3', 'POWER')
         """
-        for name in names:
-            if name not in self.aliases:
-                self.aliases.append(name)
+        # One set of the existing aliases per call instead of a list scan
+        # per name; dict.fromkeys drops repeats within `names`, in order
+        existing = set(self.aliases)
+        self.aliases.extend(name for name in dict.fromkeys(names) if name not in existing)
         return self
 
+    def _instantiate(self, part: Part) -> Pin:
+        """
+        Create this symbol pin's instance on a part.
+        
+        The symbol pin acts as the shared definition: its fields are taken
+        over as-is, and only connection state, aliases and identity are
+        per instance.
+        """
+        inst = object.__new__(Pin)
+        inst.number = self.number
+        inst.name = self.name
+        inst._pin_type = self._pin_type
+        inst.style = self.style
+        inst.position = self.position
+        inst.length = self.length
+        inst.orientation = self.orientation
+        inst._net = None
+        inst._part = part
+        inst._uuid = None
+        inst._no_connect = False
+        inst.aliases = list(self.aliases)
+        return inst
+
+    @property
+    def uuid(self) -> str:
+        """Stable UUID, generated on first use.
+        
+        Part pins derive theirs (a name-based UUIDv5) from the part's UUID
+        and pin number.
+        """
+        if self._uuid is None:
+            if self._part is not None:
+                self._uuid = str(uuid.uuid5(uuid.UUID(self._part.uuid), self.number))
+            else:
+                self._uuid = str(uuid.uuid4())
+        return self._uuid
+    
     @property
     def is_power(self) -> bool:
         """True if pin is a power pin."""
-        return self.pin_type in (PinType.POWER_IN, PinType.POWER_OUT)
+        return self._pin_type in (PinType.POWER_IN, PinType.POWER_OUT)
     
     @property
     def net(self) -> Net | None:
@@ -131,7 +182,7 @@ class Pin:
         """Convert pin to S-expression for symbol definition."""
         x, y = self.position
         return [
-            "pin", self.pin_type.value, self.style.value,
+            "pin", self._pin_type.value, self.style.value,
             ["at", x, y, self.orientation],
             ["length", self.length],
             ["name", self.name, ["effects", ["font", ["size", 1.27, 1.27]]]],
@@ -204,3 +255,19 @@ class Pin:
     def __ror__(self, other) -> Any:
         """Right parallel operator."""
         return self.__or__(other)
+
+
+def _get_pin_type(pin: Pin) -> PinType:
+    return pin._pin_type
+
+
+def _set_pin_type(pin: Pin, value: PinType):
+    # A connected pin's net keeps per-type counts; move this pin's entry
+    if pin._net is not None:
+        pin._net._retype_pin(pin._pin_type, value)
+    pin._pin_type = value
+
+
+# Assigned after the class body so the dataclass machinery still sees the
+# pin_type InitVar and its default
+Pin.pin_type = property(_get_pin_type, _set_pin_type, doc="Electrical type for ERC.")
@@ -17,23 +17,16 @@ class SheetPart(Part):
         
     def add_port(self, net_name: str, direction: str = "input"):
         # Add a pin representing the port
-        num = str(len(self._get_unique_pins()) + 1)
+        num = str(len(self._pin_list) + 1)
         pin = Pin(number=num, name=net_name)
         pin._part = self
-        self._pins[num] = pin
-        self._pins[net_name] = pin 
+        self._register_pin(pin)
         # Default pos
         pin.position = (0, 0)
 
     def _get_unique_pins(self):
-        # Helper to avoid duplicates from name/number aliasing in _pins
-        seen = set()
-        unique = []
-        for p in self._pins.values():
-            if id(p) not in seen:
-                unique.append(p)
-                seen.add(id(p))
-        return unique
+        # Each port pin is held once in _pin_list
+        return list(self._pin_list)
 
     def layout_ports(self):
         """Distribute ports on the sheet symbol edges."""
@@ -54,27 +47,14 @@ class SheetPart(Part):
         if req_height > self.height:
             self.height = req_height
             
-        # Left side
-        y = -(self.height / 2) + spacing if self.height else 0
-        # Wait, schematic coords.
-        # Y is generally centered around 0 for symbol.
-        # Top is +Y (Symbol Space).
-        # Start from top?
+        # Symbol Space (+Y up): Top = Height/2, Bottom = -Height/2.
+        # Each edge starts one spacing below the top and steps down.
+        top = (self.height / 2) - spacing
+        half_width = self.width / 2
         
-        # Let's use Symbol Space (+Y up).
-        # Top = Height/2. Bottom = -Height/2.
-        
-        current_y = (self.height / 2) - spacing
-        
-        for i, pin in enumerate(pins):
-            if i < left_count:
-                # Left Edge
-                pin.position = (-self.width/2, current_y)
-                current_y -= spacing
-                if i == left_count - 1:
-                    # Reset Y for Right side
-                     current_y = (self.height / 2) - spacing
-            else:
-                # Right Edge
-                pin.position = (self.width/2, current_y)
+        # Left Edge, then Right Edge
+        for x, edge_pins in ((-half_width, pins[:left_count]), (half_width, pins[left_count:])):
+            current_y = top
+            for pin in edge_pins:
+                pin.position = (x, current_y)
                 current_y -= spacing
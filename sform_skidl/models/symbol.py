@@ -7,7 +7,7 @@ pins, and graphical items.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Any
 import uuid
 
@@ -121,6 +121,25 @@ class Symbol:
     def footprint(self, value: str):
         self.properties["Footprint"] = value
     
+    def shallow_derive(self, derived: Symbol) -> Symbol:
+        """
+        Resolve a symbol that `extends` this one.
+        
+        The result has the derived symbol's name and properties over this
+        symbol's, and its pins and graphics if it has any (KiCad 6+
+        derived symbols usually only add properties). Pin and graphic
+        lists are shared, not copied: library symbols aren't modified
+        once loaded, and parts instantiate their own pins.
+        """
+        return replace(
+            self,
+            name=derived.name,
+            extends=derived.extends,
+            properties={**self.properties, **derived.properties},
+            pins=derived.pins or self.pins,
+            graphics=derived.graphics or self.graphics,
+        )
+    
     def get_pin(self, key: str) -> Pin | None:
         """Get pin by number or name."""
         for pin in self.pins:
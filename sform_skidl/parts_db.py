@@ -8,6 +8,7 @@ to resolve vendor-specific part numbers for BOM export.
 from __future__ import annotations
 
 import csv
+import heapq
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -116,6 +117,10 @@ class PartsDatabase:
         """
         self._specs: list[PartSpec] = []
         self.stock_type = stock_type
+        # Spec indices keyed by exact value ("" = matches any value)
+        self._by_value: dict[str, list[int]] = {}
+        # First spec registered for each LCSC part number
+        self._by_lcsc: dict[str, PartSpec] = {}
     
     def add(
         self,
@@ -161,16 +166,36 @@ class PartsDatabase:
             stock_type=stock_type,
             vendors=vendors,
         )
+        self._by_value.setdefault(value, []).append(len(self._specs))
+        if lcsc:
+            self._by_lcsc.setdefault(lcsc, spec)
         self._specs.append(spec)
     
+    def _candidates(self, part: "Part"):
+        """Yield specs that could match part's value, in database order."""
+        exact = self._by_value.get(part.value, ())
+        wildcard = self._by_value.get("", ()) if part.value else ()
+        for idx in heapq.merge(exact, wildcard):
+            yield self._specs[idx]
+    
     def find(self, part: "Part", stock_type: str | None = None) -> PartSpec | None:
         """Find matching spec for a part, optionally filtering by stock type."""
         filter_type = stock_type or self.stock_type
-        for spec in self._specs:
+        for spec in self._candidates(part):
             if spec.matches(part, require_stock_type=filter_type):
                 return spec
         return None
     
+    def find_lcsc(self, lcsc: str) -> PartSpec | None:
+        """
+        Look up a spec by its LCSC part number.
+        
+        Example:
+            spec = db.find_lcsc('C25804')
+            spec.value  # -> '10K'
+        """
+        return self._by_lcsc.get(lcsc)
+    
     def apply_to_part(self, part: "Part", stock_type: str | None = None) -> bool:
         """
         Apply vendor fields to a part from database.
@@ -202,8 +227,15 @@ class PartsDatabase:
         unmatched = []
         missing_vendors = []  # Parts matched but missing some vendor numbers
         
+        # Identical parts resolve to the same spec; look each shape up once
+        resolved: dict[tuple, PartSpec | None] = {}
+        
         for part in circuit.parts:
-            spec = self.find(part, stock_type)
+            key = (part.name, part.value, part.footprint, part.fields.get('tolerance', ''))
+            if key in resolved:
+                spec = resolved[key]
+            else:
+                spec = resolved[key] = self.find(part, stock_type)
             if spec:
                 for vendor, number in spec.vendors.items():
                     part.fields[vendor] = number
@@ -42,6 +42,12 @@ class Router:
     def __init__(self, grid_size=1.27):
         self.grid_size = grid_size
         self.obstacles: List[Rect] = []
+        # Obstacle bounds as plain tuples, and which grid nodes they block.
+        # The blocked-node cache is kept across route() calls and dropped
+        # whenever the bounds differ from the ones it was computed for, so
+        # edits made to `obstacles` directly are seen too.
+        self._bounds: List[Tuple[float, float, float, float]] = []
+        self._blocked: dict = {}
         
     def add_obstacle(self, x, y, width, height):
         # x, y is center
@@ -55,25 +61,36 @@ class Router:
         return round(val / self.grid_size) * self.grid_size
         
     def route(self, start: Tuple[float, float], end: Tuple[float, float]) -> List[Tuple[float, float]]:
-        # A* Search
-        start_p = Point(self._snap(start[0]), self._snap(start[1]))
-        end_p = Point(self._snap(end[0]), self._snap(end[1]))
+        # A* Search over plain (x, y) tuples. Coordinates, costs and heap
+        # order are computed exactly as with Point, so paths are identical.
+        g = self.grid_size
+        sx, sy = self._snap(start[0]), self._snap(start[1])
+        ex, ey = self._snap(end[0]), self._snap(end[1])
+        start_p = (sx, sy)
+        end_p = (ex, ey)
         
         if start_p == end_p:
             return [start, end]
             
-        open_set = []
-        heapq.heappush(open_set, (0, start_p))
+        open_set = [(0, start_p)]
+        # Nodes currently in open_set, instead of scanning the heap
+        in_open = {start_p}
         
         came_from = {}
         g_score = {start_p: 0}
-        f_score = {start_p: start_p.dist(end_p)}
         
         # Directions: Up, Down, Left, Right
-        directions = [Point(0, self.grid_size), Point(0, -self.grid_size), 
-                      Point(self.grid_size, 0), Point(-self.grid_size, 0)]
+        directions = ((0, g), (0, -g), (g, 0), (-g, 0))
         
-        visited = set()
+        bounds = [(o.min_x, o.min_y, o.max_x, o.max_y) for o in self.obstacles]
+        if bounds != self._bounds:
+            self._bounds = bounds
+            self._blocked = {}
+        obstacles = self._bounds
+        blocked_cache = self._blocked
+        inf = float('inf')
+        heappush = heapq.heappush
+        heappop = heapq.heappop
         
         # Limit search to avoid infinite loops in open space
         max_steps = 2000 
@@ -85,46 +102,48 @@ class Router:
                 # Fallback to direct routing if stuck
                 return [start, (end[0], start[1]), end]
                 
-            current = heapq.heappop(open_set)[1]
+            current = heappop(open_set)[1]
+            in_open.discard(current)
             
             if current == end_p:
                 return self._reconstruct_path(came_from, current)
-                
-            visited.add(current)
             
-            for d in directions:
-                neighbor = current + d
+            cx, cy = current
+            prev = came_from.get(current)
+            if prev is not None:
+                prev_dir = (cx - prev[0], cy - prev[1])
+            g_current = g_score[current] + g
+            
+            for dx, dy in directions:
+                nx, ny = cx + dx, cy + dy
+                neighbor = (nx, ny)
                 
                 # Check bounds/obstacles
                 # Allow endpoint to be inside obstacle (it's the pin)
-                is_blocked = False
                 if neighbor != start_p and neighbor != end_p:
-                    for obs in self.obstacles:
-                        if obs.contains(neighbor):
-                            is_blocked = True
-                            break
-                
-                if is_blocked:
-                    continue
+                    is_blocked = blocked_cache.get(neighbor)
+                    if is_blocked is None:
+                        is_blocked = False
+                        for x0, y0, x1, y1 in obstacles:
+                            if x0 <= nx <= x1 and y0 <= ny <= y1:
+                                is_blocked = True
+                                break
+                        blocked_cache[neighbor] = is_blocked
+                    if is_blocked:
+                        continue
                     
-                # Cost: Base 1. Penalty for turns?
-                # Simple implementation: Cost = distance
-                tentative_g = g_score[current] + self.grid_size
-                
-                # Penalty for turning
-                if current in came_from:
-                    prev = came_from[current]
-                    prev_dir = current - prev
-                    curr_dir = neighbor - current
-                    if prev_dir != curr_dir:
-                        tentative_g += self.grid_size # Turn cost
+                # Cost: distance, plus a penalty for turning
+                tentative_g = g_current
+                if prev is not None and prev_dir != (nx - cx, ny - cy):
+                    tentative_g += g # Turn cost
                 
-                if tentative_g < g_score.get(neighbor, float('inf')):
+                if tentative_g < g_score.get(neighbor, inf):
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + neighbor.dist(end_p)
-                    if neighbor not in [i[1] for i in open_set]:
-                        heapq.heappush(open_set, (f_score[neighbor], neighbor))
+                    if neighbor not in in_open:
+                        f = tentative_g + (abs(nx - ex) + abs(ny - ey))
+                        heappush(open_set, (f, neighbor))
+                        in_open.add(neighbor)
                         
         # Fallback
         return [start, (end[0], start[1]), end]
@@ -135,4 +154,4 @@ class Router:
             current = came_from[current]
             path.append(current)
         path.reverse()
-        return [(p.x, p.y) for p in path]
+        return path
@@ -1,6 +1,9 @@
 """S-expression parser and writer for KiCad file formats."""
 
 from .parser import parse, parse_file
-from .writer import serialize, serialize_to_file
+from .writer import SExprText, format_atom, serialize, serialize_block_to_file, serialize_to_file
 
-__all__ = ["parse", "parse_file", "serialize", "serialize_to_file"]
+__all__ = [
+    "parse", "parse_file", "serialize", "serialize_to_file", "serialize_block_to_file",
+    "SExprText", "format_atom",
+]
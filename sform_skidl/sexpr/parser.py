@@ -66,33 +66,18 @@ class Tokenizer:
             yield kind, value
 
 
+# Escape sequences understood inside quoted strings; others are kept as-is
+_UNESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
+_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+
+
 def _unescape_string(s: str) -> str:
     """Unescape a quoted string, handling common escape sequences."""
     # Remove surrounding quotes
     s = s[1:-1]
-    # Handle escape sequences - order matters for backslash
-    result = []
-    i = 0
-    while i < len(s):
-        if s[i] == '\\' and i + 1 < len(s):
-            next_char = s[i + 1]
-            if next_char == 'n':
-                result.append('\n')
-            elif next_char == 'r':
-                result.append('\r')
-            elif next_char == 't':
-                result.append('\t')
-            elif next_char == '"':
-                result.append('"')
-            elif next_char == '\\':
-                result.append('\\')
-            else:
-                result.append(s[i:i+2])  # Keep unknown escapes as-is
-            i += 2
-        else:
-            result.append(s[i])
-            i += 1
-    return ''.join(result)
+    if "\\" not in s:
+        return s
+    return _ESCAPE_RE.sub(lambda m: _UNESCAPES.get(m.group(1), m.group(0)), s)
 
 
 def _convert_atom(value: str):
@@ -113,6 +98,18 @@ def _convert_atom(value: str):
     return value
 
 
+# Single-scan tokenizer for parse(). Whitespace is skipped by finditer;
+# every other character is claimed by some group, the last one catching
+# an unterminated string's lone quote.
+_TOKEN_RE = re.compile(
+    r'(\()'                     # 1: open paren
+    r'|(\))'                    # 2: close paren
+    r'|("(?:[^"\\]|\\.)*")'     # 3: quoted string
+    r'|([^\s()"]+)'             # 4: atom
+    r'|(\S)'                    # 5: anything else (error)
+)
+
+
 def parse(text: str) -> list[SExpr]:
     """
     Parse S-expression text into nested Python lists.
@@ -130,50 +127,42 @@ def parse(text: str) -> list[SExpr]:
         >>> parse('(symbol "R1" (value "10K"))')
         [['symbol', 'R1', ['value', '10K']]]
     """
-    tokenizer = Tokenizer(text)
-    tokens = list(tokenizer.tokens())
-    
-    if not tokens:
-        return []
-    
     results = []
-    idx = 0
+    items = results   # List currently being filled
+    open_lists = []   # (parent list, start position) for each open paren
+    atoms = {}        # Atom text -> converted value; tokens repeat heavily
     
-    def parse_expr(start: int) -> tuple[SExpr, int]:
-        """Parse a single expression starting at token index."""
-        kind, value = tokens[start]
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastindex
         
-        if kind == "LPAREN":
-            # Parse list
-            items = []
-            idx = start + 1
-            
-            while idx < len(tokens):
-                k, v = tokens[idx]
-                if k == "RPAREN":
-                    return items, idx + 1
-                
-                item, idx = parse_expr(idx)
-                items.append(item)
-            
-            raise ParseError("Unclosed parenthesis", start)
+        if kind == 1:  # (
+            open_lists.append((items, match.start()))
+            child = []
+            items.append(child)
+            items = child
         
-        elif kind == "STRING":
-            return _unescape_string(value), start + 1
+        elif kind == 2:  # )
+            if not open_lists:
+                raise ParseError("Unexpected closing parenthesis", match.start())
+            items = open_lists.pop()[0]
         
-        elif kind == "ATOM":
-            # Try to convert numeric atoms to numbers
-            return _convert_atom(value), start + 1
+        elif kind == 3:  # "string"
+            items.append(_unescape_string(match.group(3)))
         
-        elif kind == "RPAREN":
-            raise ParseError("Unexpected closing parenthesis", start)
+        elif kind == 4:  # atom
+            value = match.group(4)
+            atom = atoms.get(value)
+            if atom is None:
+                # Try to convert numeric atoms to numbers
+                atom = atoms[value] = _convert_atom(value)
+            items.append(atom)
         
         else:
-            raise ParseError(f"Unexpected token type: {kind}", start)
+            pos = match.start()
+            raise ParseError("Unexpected character", pos, repr(text[pos:pos+10]))
     
-    while idx < len(tokens):
-        expr, idx = parse_expr(idx)
-        results.append(expr)
+    if open_lists:
+        raise ParseError("Unclosed parenthesis", open_lists[-1][1])
     
     return results
 
@@ -7,9 +7,10 @@ compatible with KiCad tools.
 
 from __future__ import annotations
 
+import os
 import re
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Iterator, Union
 
 # Type alias for S-expression data
 SExpr = Union[str, int, float, list["SExpr"]]
@@ -34,28 +35,40 @@ INLINE_TOKENS = {
 }
 
 
+# Bare KiCad tokens: lowercase with underscores only. Anything else
+# (uppercase, whitespace, parens, quotes, empty) must be quoted.
+_BARE_TOKEN_RE = re.compile(r'[a-z_][a-z0-9_]*')
+
+
+class SExprText(str):
+    """
+    Pre-formatted S-expression text, written verbatim as one item by
+    serialize_block_to_file.
+    
+    The text must already carry the item's indentation (one level) and
+    must not end with a newline.
+    """
+    __slots__ = ()
+
+
 def _needs_quoting(s: str) -> bool:
     """Check if a string needs to be quoted."""
-    if not s:
-        return True
-    # KiCad tokens are lowercase with underscores only
-    # Quote anything else (including property values with uppercase)
-    if re.search(r'[\s()"\\]', s):
-        return True
-    # Quote strings that aren't valid tokens (contain uppercase or other chars)
-    if not re.match(r'^[a-z_][a-z0-9_]*$', s):
-        return True
-    return False
+    return _BARE_TOKEN_RE.fullmatch(s) is None
+
+
+# Single-pass escape table for quoted strings
+_ESCAPE_TABLE = str.maketrans({
+    "\\": "\\\\",
+    '"': '\\"',
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+})
 
 
 def _escape_string(s: str) -> str:
     """Escape a string for S-expression output."""
-    s = s.replace("\\", "\\\\")
-    s = s.replace('"', '\\"')
-    s = s.replace("\n", "\\n")
-    s = s.replace("\r", "\\r")
-    s = s.replace("\t", "\\t")
-    return f'"{s}"'
+    return f'"{s.translate(_ESCAPE_TABLE)}"'
 
 
 def _format_value(value: SExpr) -> str:
@@ -76,6 +89,10 @@ def _format_value(value: SExpr) -> str:
         raise TypeError(f"Unsupported value type: {type(value)}")
 
 
+# Public name for code that emits pre-formatted SExprText
+format_atom = _format_value
+
+
 def _is_simple_list(lst: list) -> bool:
     """Check if a list should be rendered inline (no nested lists)."""
     if not lst:
@@ -93,44 +110,41 @@ def _is_simple_list(lst: list) -> bool:
     return not any(isinstance(item, list) for item in lst)
 
 
-def serialize(data: SExpr, indent: int = 2, compact: bool = False) -> str:
-    """
-    Serialize nested Python lists to S-expression text.
+def _format_inline(lst: list) -> str:
+    """Format a list and all of its children on a single line."""
+    if not lst:
+        return "()"
+    return "(" + " ".join(
+        _format_inline(item) if isinstance(item, list) else _format_value(item)
+        for item in lst
+    ) + ")"
+
+
+def _iter_lines(data: list, indent: int, compact: bool, depth: int = 0) -> Iterator[str]:
+    """Yield the formatted lines of a list, starting at `depth`."""
+    # Explicit stack instead of recursion. Entries are (list, depth) to
+    # write, or (line, None) for text that is already formatted, such as
+    # closing parens. Children are pushed in reverse so they pop in order.
+    stack = [(data, depth)]
     
-    Args:
-        data: Nested list structure to serialize.
-        indent: Number of spaces for indentation.
-        compact: If True, minimize whitespace.
+    while stack:
+        lst, depth = stack.pop()
+        if depth is None:
+            yield lst
+            continue
         
-    Returns:
-        Formatted S-expression string.
-        
-    Example:
-        >>> serialize(['symbol', 'R1', ['value', '10K']])
-        '(symbol "R1"\\n  (value "10K")\\n)'
-    """
-    lines = []
-    
-    def write_list(lst: list, depth: int = 0):
-        """Recursively write a list expression."""
         if not lst:
-            lines.append("()")
-            return
+            yield "()"
+            continue
         
         prefix = "" if compact else " " * (depth * indent)
         
         # Check if this list should be inline
-        if _is_simple_list(lst) or compact:
-            parts = [_format_value(item) if not isinstance(item, list) 
-                    else serialize(item, indent, compact=True) 
-                    for item in lst]
-            lines.append(f"{prefix}({' '.join(parts)})")
-            return
+        if compact or _is_simple_list(lst):
+            yield prefix + _format_inline(lst)
+            continue
         
-        # Multi-line list
-        token = lst[0] if lst and isinstance(lst[0], str) else ""
-        
-        # Opening with first element
+        # Multi-line list: opening with the leading atoms
         first_parts = []
         rest_start = 0
         
@@ -145,28 +159,45 @@ def serialize(data: SExpr, indent: int = 2, compact: bool = False) -> str:
         
         if rest_start >= len(lst):
             # No nested lists
-            lines.append(f"{opening})")
-            return
+            yield f"{opening})"
+            continue
         
-        lines.append(opening)
+        yield opening
         
-        # Write nested elements
-        for item in lst[rest_start:]:
+        # Closing, then nested elements (in reverse)
+        stack.append((f"{prefix})", None))
+        inner_prefix = " " * ((depth + 1) * indent)
+        for item in reversed(lst[rest_start:]):
             if isinstance(item, list):
-                write_list(item, depth + 1)
+                stack.append((item, depth + 1))
             else:
-                inner_prefix = " " * ((depth + 1) * indent)
-                lines.append(f"{inner_prefix}{_format_value(item)}")
-        
-        # Closing
-        lines.append(f"{prefix})")
+                stack.append((f"{inner_prefix}{_format_value(item)}", None))
+
+
+def serialize(data: SExpr, indent: int = 2, compact: bool = False) -> str:
+    """
+    Serialize nested Python lists to S-expression text.
     
-    if isinstance(data, list):
-        write_list(data)
-    else:
+    Args:
+        data: Nested list structure to serialize.
+        indent: Number of spaces for indentation.
+        compact: If True, minimize whitespace.
+        
+    Returns:
+        Formatted S-expression string.
+        
+    Example:
+        >>> serialize(['symbol', 'R1', ['value', '10K']])
+        '(symbol "R1"\\n  (value "10K")\\n)'
+    """
+    if not isinstance(data, list):
         return _format_value(data)
     
-    return "\n".join(lines)
+    return "\n".join(_iter_lines(data, indent, compact))
+
+
+# Output buffer for file writes; large files are written in big chunks
+_FILE_BUFFER_SIZE = 1 << 20
 
 
 def serialize_to_file(data: SExpr, path: Path | str, indent: int = 2):
@@ -180,5 +211,67 @@ def serialize_to_file(data: SExpr, path: Path | str, indent: int = 2):
     """
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    text = serialize(data, indent)
-    path.write_text(text + "\n", encoding="utf-8")
+    if not isinstance(data, list):
+        path.write_text(_format_value(data) + "\n", encoding="utf-8")
+        return
+    
+    # Write line by line rather than joining the whole document first
+    with open(path, "w", encoding="utf-8", buffering=_FILE_BUFFER_SIZE) as f:
+        write = f.write
+        for i, line in enumerate(_iter_lines(data, indent, False)):
+            if i:
+                write("\n")
+            write(line)
+        write("\n")
+
+
+def serialize_block_to_file(
+    token: str,
+    items: Iterable[SExpr],
+    path: Path | str,
+    indent: int = 2,
+):
+    """
+    Stream a top-level `(token item...)` block to a file.
+    
+    Items are formatted and written one at a time as they are pulled
+    from `items`, so a generator never has to materialize the whole
+    tree. The output matches serialize_to_file([token, *items]) for
+    block tokens such as kicad_sch. SExprText items are written as-is.
+    
+    The text goes to a temporary file next to `path` that replaces it
+    only once complete, so an error raised by `items` leaves any
+    existing file untouched.
+    
+    Args:
+        token: Head atom of the block (e.g. "kicad_sch").
+        items: Child expressions, typically a generator.
+        path: Output file path.
+        indent: Number of spaces for indentation.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    inner_prefix = " " * indent
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=_FILE_BUFFER_SIZE) as f:
+            write = f.write
+            write(f"({_format_value(token)}")
+            empty = True
+            for item in items:
+                empty = False
+                if isinstance(item, list):
+                    for line in _iter_lines(item, indent, False, 1):
+                        write("\n")
+                        write(line)
+                elif isinstance(item, SExprText):
+                    write("\n")
+                    write(item)
+                else:
+                    write(f"\n{inner_prefix}{_format_value(item)}")
+            write(")\n" if empty else "\n)\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
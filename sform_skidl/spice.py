@@ -60,7 +60,7 @@ def generate_spice(
         
         # Get connected nets for each pin
         pin_nets = []
-        for pin in part.pins:
+        for pin in part._pin_list:
             if pin.net:
                 pin_nets.append(net_map.get(pin.net.name, pin.net.name))
             else:
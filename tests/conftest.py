@@ -0,0 +1,49 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+# Default symbol for write_symbol_lib: input A on pin 1, output Y on pin 2
+_BUF_SYMBOL = (
+    '(symbol "BUF" (property "Reference" "U")\n'
+    '    (symbol "BUF_1_1"\n'
+    '      (pin input line (at -5.08 0 0) (length 2.54) (name "A") (number "1"))\n'
+    '      (pin output line (at 5.08 0 180) (length 2.54) (name "Y") (number "2"))))'
+)
+
+
+@pytest.fixture(autouse=True)
+def _no_lib_disk_cache(monkeypatch):
+    """Keep tests from writing parsed libraries to the user's cache directory."""
+    from sform_skidl.io import symbol_lib
+    
+    monkeypatch.setattr(symbol_lib, "lib_cache_dir", None)
+
+
+@pytest.fixture
+def write_symbol_lib(tmp_path):
+    """
+    Return a function that writes `<name>.kicad_sym` into tmp_path.
+    
+    Each extra argument is one top-level symbol as S-expression text; with
+    none, the library holds a single BUF symbol. The function returns the
+    library's path.
+    """
+    def write(name, *symbols):
+        path = tmp_path / f"{name}.kicad_sym"
+        body = "".join(f"  {symbol}\n" for symbol in symbols or (_BUF_SYMBOL,))
+        path.write_text(f'(kicad_symbol_lib (version 20231120) (generator "test")\n{body})\n')
+        return path
+    return write
+
+
+@pytest.fixture
+def lib_paths():
+    """lib_search_paths, restored along with the library caches afterwards."""
+    from sform_skidl.io import symbol_lib
+    
+    saved = list(symbol_lib.lib_search_paths)
+    yield symbol_lib.lib_search_paths
+    symbol_lib.clear_lib_paths()
+    symbol_lib.lib_search_paths.extend(saved)
@@ -2,6 +2,7 @@
 Additional coverage tests for api.py, bus.py, and symbol_lib.py.
 """
 
+import os
 import pytest
 import tempfile
 from pathlib import Path
@@ -150,6 +151,22 @@ class TestSymbolLibraryFunctions:
         result = find_kicad_symbols()
         assert result is None or isinstance(result, Path)
     
+    def test_find_kicad_symbols_memoized(self, tmp_path, monkeypatch):
+        """The detected directory is reused until clear_lib_paths()."""
+        monkeypatch.setenv('KICAD_SYMBOL_DIR', str(tmp_path))
+        clear_lib_paths()
+        try:
+            assert find_kicad_symbols() == tmp_path
+            monkeypatch.delenv('KICAD_SYMBOL_DIR')
+            assert find_kicad_symbols() == tmp_path
+            info = find_kicad_symbols.cache_info()
+            assert (info.misses, info.hits) == (1, 1)
+            
+            clear_lib_paths()
+            assert find_kicad_symbols.cache_info().currsize == 0
+        finally:
+            clear_lib_paths()
+    
     def test_add_and_clear_lib_paths(self):
         """add_lib_path and clear_lib_paths work correctly."""
         clear_lib_paths()
@@ -171,6 +188,191 @@ class TestSymbolLibraryFunctions:
         assert count == 1
         
         clear_lib_paths()
+    
+    def test_add_lib_path_invalidates_lookup(self, write_symbol_lib, lib_paths, tmp_path):
+        """Adding a library path makes previously missing symbols resolvable."""
+        write_symbol_lib("CacheLib")
+        before = Part('CacheLib', 'BUF')
+        assert 'A' not in before._by_name
+        
+        add_lib_path(tmp_path)
+        after = Part('CacheLib', 'BUF')
+        assert after['A'].pin_type == PinType.INPUT
+    
+    def test_editing_lib_search_paths_invalidates_lookup(self, write_symbol_lib, lib_paths, tmp_path):
+        """Changing lib_search_paths in place is seen by resolve_symbol."""
+        from sform_skidl.io.symbol_lib import resolve_symbol
+        
+        write_symbol_lib("EditLib")
+        assert resolve_symbol('EditLib', 'BUF') is None
+        
+        lib_paths.insert(0, tmp_path)
+        assert resolve_symbol('EditLib', 'BUF').name == 'BUF'
+        
+        lib_paths.remove(tmp_path)
+        assert resolve_symbol('EditLib', 'BUF') is None
+    
+    def test_parsed_library_cached_on_disk(self, write_symbol_lib, tmp_path, monkeypatch):
+        """Parsed libraries are pickled and invalidated by file changes."""
+        import os
+        from sform_skidl.io import symbol_lib
+        
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(symbol_lib, "lib_cache_dir", cache_dir)
+        
+        def write(pin_name, mtime_ns):
+            path = write_symbol_lib("Disk", (
+                '(symbol "BUF" (symbol "BUF_1_1"\n'
+                f'    (pin input line (at 0 0 0) (length 2.54) (name "{pin_name}") (number "1"))))'
+            ))
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+            return path
+        
+        lib_path = write("A", 1_000_000_000)
+        SymbolLibrary("Disk", lib_path)._load()
+        assert len(list(cache_dir.glob("Disk-*.pkl"))) == 1
+        
+        cached = SymbolLibrary("Disk", lib_path)
+        cached._load()
+        assert cached["BUF"].pins[0].name == "A"
+        
+        write("B", 2_000_000_000)
+        assert SymbolLibrary("Disk", lib_path)["BUF"].pins[0].name == "B"
+        # The edited library replaced its entry instead of adding one
+        assert len(list(cache_dir.glob("Disk-*.pkl"))) == 1
+    
+    def test_disk_cache_is_opt_in(self, tmp_path, monkeypatch):
+        """Nothing is written to disk until enable_lib_cache() is called."""
+        from sform_skidl import enable_lib_cache
+        from sform_skidl.io import symbol_lib
+        
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert symbol_lib._lib_cache_path(tmp_path / "X.kicad_sym") is None
+        
+        enable_lib_cache()
+        assert symbol_lib.lib_cache_dir == tmp_path / "sform_skidl"
+        enable_lib_cache(tmp_path / "elsewhere")
+        assert symbol_lib.lib_cache_dir == tmp_path / "elsewhere"
+    
+    @pytest.mark.skipif(not hasattr(os, 'getuid'), reason="POSIX permissions")
+    def test_disk_cache_ignores_writable_by_others(self, write_symbol_lib, tmp_path, monkeypatch):
+        """Pickles are only loaded from a directory and file others can't write."""
+        from sform_skidl.io import symbol_lib
+        
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(symbol_lib, "lib_cache_dir", cache_dir)
+        lib_path = write_symbol_lib("Priv")
+        lib = SymbolLibrary("Priv", lib_path)
+        lib._load()
+        assert cache_dir.stat().st_mode & 0o777 == 0o700
+        (entry,) = cache_dir.glob("Priv-*.pkl")
+        cache_path = symbol_lib._lib_cache_path(lib_path)
+        assert symbol_lib._read_lib_cache(cache_path, lib._stamp) is not None
+        
+        os.chmod(entry, 0o666)
+        assert symbol_lib._read_lib_cache(cache_path, lib._stamp) is None
+        os.chmod(entry, 0o644)
+        os.chmod(cache_dir, 0o777)
+        assert symbol_lib._read_lib_cache(cache_path, lib._stamp) is None
+    
+    def test_library_parses_symbols_on_demand(self, write_symbol_lib):
+        """Only the symbols asked for are parsed; names come from the index."""
+        lib_path = write_symbol_lib(
+            "Lazy",
+            '(symbol "A" (property "Description" "has ) and \\" inside"))',
+            '(symbol "B" (property "Reference" "U")\n'
+            '    (symbol "B_1_1"\n'
+            '      (pin input line (at 0 0 0) (length 2.54) (name "X") (number "1"))))',
+        )
+        
+        lib = SymbolLibrary("Lazy", lib_path)
+        assert list(lib) == ["A", "B"] and "B" in lib
+        assert lib._symbols == {}
+        
+        assert lib["B"].pins[0].name == "X"
+        assert list(lib._symbols) == ["B"]
+        
+        assert [s.name for s in lib.symbols()] == ["A", "B"]
+        assert lib["A"].properties["Description"] == 'has ) and " inside'
+    
+    def test_library_reindexes_edited_file(self, write_symbol_lib):
+        """Editing the file after indexing doesn't parse stale offsets."""
+        lib_path = write_symbol_lib(
+            "Edit",
+            '(symbol "A" (property "Reference" "R"))',
+            '(symbol "B" (property "Reference" "C"))',
+        )
+        lib = SymbolLibrary("Edit", lib_path)
+        assert lib["A"].reference == "R"
+        
+        write_symbol_lib(
+            "Edit",
+            '(symbol "NEW" (property "Reference" "U"))',
+            '(symbol "B" (property "Reference" "L"))',
+        )
+        assert lib["B"].reference == "L"
+        assert "NEW" in lib and "A" not in lib
+    
+    def test_index_tolerates_trailing_text(self, write_symbol_lib):
+        """Text after the closing paren is not scanned for tokens."""
+        from sform_skidl.io.symbol_lib import _index_symbols
+        
+        lib_path = write_symbol_lib("Tail")
+        lib_path.write_text(lib_path.read_text() + ' \n' * 50000)
+        assert list(_index_symbols(lib_path)) == ["BUF"]
+    
+    def test_auto_discover_prefetches_common_libs(self, write_symbol_lib, lib_paths, tmp_path, monkeypatch):
+        """Discovered common libraries are loaded in the background."""
+        from sform_skidl.io import symbol_lib
+        
+        monkeypatch.setenv("KICAD_SYMBOL_DIR", str(tmp_path))
+        write_symbol_lib("Device", '(symbol "R" (property "Reference" "R"))')
+        clear_lib_paths()
+        
+        assert auto_discover_libs()
+        assert set(symbol_lib._prefetches) == set(symbol_lib._COMMON_LIBS)
+        
+        device = symbol_lib.get_library("Device")
+        assert device._loaded and list(device) == ["R"]
+        assert "Device" not in symbol_lib._prefetches
+        
+        with pytest.raises(FileNotFoundError):
+            symbol_lib.get_library("Connector")._load()
+        
+        clear_lib_paths()
+        assert symbol_lib._prefetches == {}
+    
+    def test_search_parts_reads_names_only(self, write_symbol_lib, lib_paths, tmp_path):
+        """Searching a library matches names without parsing any symbol."""
+        from sform_skidl.io import symbol_lib
+        
+        write_symbol_lib(
+            "Search",
+            '(symbol "LM7805" (property "Reference" "U"))',
+            '(symbol "AMS1117" (property "Reference" "U"))',
+        )
+        add_lib_path(tmp_path)
+        assert search_parts('lm78', library='Search') == [('Search', 'LM7805')]
+        assert symbol_lib.get_library('Search')._symbols == {}
+    
+    def test_derived_symbol_inherits_parent(self, write_symbol_lib):
+        """Symbols that extend another take its pins and keep their own properties."""
+        lib_path = write_symbol_lib(
+            "Derived",
+            '(symbol "OPAMP" (property "Reference" "U") (property "Footprint" "SOIC-8")\n'
+            '    (symbol "OPAMP_1_1"\n'
+            '      (pin input line (at 0 0 0) (length 2.54) (name "+") (number "3"))))',
+            '(symbol "LM358" (extends "OPAMP") (property "Reference" "U") (property "Value" "LM358"))',
+        )
+        
+        lib = SymbolLibrary("Derived", lib_path)
+        derived = lib["LM358"]
+        
+        assert derived.name == "LM358" and derived.extends == "OPAMP"
+        assert derived.value == "LM358" and derived.footprint == "SOIC-8"
+        assert [p.name for p in derived.pins] == ["+"]
+        assert lib["LM358"] is derived
+        assert lib["OPAMP"].value == "OPAMP"
 
 
 class TestNetlistGeneration:
@@ -195,6 +397,23 @@ class TestNetlistGeneration:
         content = Path(path).read_text()
         assert 'export' in content or 'netlist' in content.lower()
         Path(path).unlink()
+    
+    def test_generate_netlist_escapes_strings(self, tmp_path):
+        """Quotes and backslashes in names are escaped."""
+        from sform_skidl.sexpr import parse
+        
+        r = Part('Device', 'R', value='1/4" 10K')
+        n = Net('A\\B')
+        n += r[1]
+        
+        path = tmp_path / "escaped.net"
+        generate_netlist(str(path))
+        
+        text = path.read_text()
+        assert '(value "1/4\\" 10K")' in text
+        root = parse(text)[0]
+        nets = next(item for item in root if item[0] == 'nets')
+        assert nets[1][2] == ['name', 'A\\B']
 
 
 class TestCircuitManagement:
@@ -2,6 +2,9 @@
 Additional tests to improve coverage of core modules.
 """
 
+import os
+import uuid
+
 import pytest
 from sform_skidl import (
     Part, Net, Pin, PinType, Bus, PinGroup,
@@ -49,6 +52,19 @@ class TestNetOperators:
         n += p  # Connect whole part
         assert len(n.pins) == 2
     
+    def test_net_iadd_mixed_list(self):
+        """net += [...] accepts pins, parts and nested lists together."""
+        n = Net('TEST')
+        r1 = Part('Device', 'R')
+        r1.set_pin_count(2)
+        r2 = Part('Device', 'R')
+        r2.set_pin_count(3)
+        
+        n += [r1, r2[1], [r2[2], (r2[3],)]]
+        assert n.pins == r1.pins + r2.pins
+        with pytest.raises(TypeError):
+            n += [r1[1], 42]
+    
     def test_net_series_connection(self):
         """net & part & net creates series connection."""
         vin = Net('VIN')
@@ -90,6 +106,87 @@ class TestNetOperators:
         
         assert n.is_power is True
     
+    def test_net_pin_type_counts_follow_connections(self):
+        """Net keeps per-type pin counts in step with connect/disconnect."""
+        from sform_skidl.models.part import Part as PartClass
+        
+        sym = Symbol(name='BUF', pins=[
+            Pin('1', 'A', PinType.INPUT),
+            Pin('2', 'Y', PinType.OUTPUT),
+        ])
+        u = PartClass(lib='Logic', name='BUF', _symbol=sym)
+        n = Net('SIG')
+        n += u['A'], u['Y']
+        assert n._type_counts[PinType.INPUT] == 1
+        assert n._type_counts[PinType.OUTPUT] == 1
+        
+        u['Y'].disconnect()
+        assert n._type_counts[PinType.OUTPUT] == 0
+        assert n._type_counts[PinType.INPUT] == 1
+    
+    def test_net_membership_is_by_identity(self):
+        """Pins are tracked once each, and `in` follows connect/disconnect."""
+        n = Net('SIG')
+        p = Part('Device', 'R')
+        p.set_pin_count(2)
+        
+        n += p[1]
+        n += p[1]
+        n | n
+        assert n.pins == [p[1]]
+        assert p[1] in n and p[2] not in n
+        
+        p[1].disconnect()
+        assert p[1] not in n and n.pins == []
+    
+    def test_net_drive_pin_follows_connections(self):
+        """drive_pin prefers outputs and is recomputed after pins change."""
+        from sform_skidl.models.part import Part as PartClass
+        
+        sym = Symbol(name='XCVR', pins=[
+            Pin('1', 'IO', PinType.BIDIRECTIONAL),
+            Pin('2', 'Y', PinType.OUTPUT),
+        ])
+        u = PartClass(lib='Logic', name='XCVR', _symbol=sym)
+        n = Net('SIG')
+        assert n.drive_pin is None
+        
+        n += u['IO']
+        assert n.drive_pin is u['IO']
+        n += u['Y']
+        assert n.drive_pin is u['Y']
+        
+        u['Y'].disconnect()
+        assert n.drive_pin is u['IO']
+    
+    def test_net_follows_pin_type_changes(self):
+        """is_power and drive_pin see pins retyped after connecting."""
+        n = Net('SIG')
+        r = Part('Device', 'R')
+        n += r[1]
+        assert n.drive_pin is None and not n.is_power
+        
+        r[1].pin_type = PinType.POWER_OUT
+        assert n.drive_pin is r[1] and n.is_power
+        
+        r[1].pin_type = PinType.PASSIVE
+        assert n.drive_pin is None and not n.is_power
+    
+    def test_uuids_are_lazy_and_stable(self):
+        """UUIDs are made on first use; pins derive theirs from the part."""
+        n = Net('SIG')
+        p = Part('Device', 'R')
+        p.set_pin_count(2)
+        inst = Part('Logic', 'BUF', _symbol=Symbol(name='BUF', pins=[Pin('1', 'A')]))
+        
+        assert n._uuid is None and inst._uuid is None and inst[1]._uuid is None
+        assert n.uuid == n.uuid
+        assert inst[1].uuid == str(uuid.uuid5(uuid.UUID(inst.uuid), "1"))
+        assert uuid.UUID(inst[1].uuid).version == 5
+        assert p[1].uuid != p[2].uuid
+        # Equality is identity, not field-by-field
+        assert p[1] != Pin('1', '1') and Net('X') != Net('X')
+    
     def test_net_counter(self):
         """Auto-named nets use counter."""
         reset_circuit()
@@ -301,6 +398,18 @@ class TestLibraryFunctions:
         libs = list_libraries()
         assert isinstance(libs, list)
     
+    def test_list_libraries_sees_new_files(self, tmp_path):
+        """Cached directory listings are refreshed when files are added."""
+        import os
+        
+        (tmp_path / "B.kicad_sym").write_text("")
+        (tmp_path / "notes.txt").write_text("")
+        assert list_libraries(tmp_path) == ["B"]
+        
+        (tmp_path / "A.kicad_sym").write_text("")
+        os.utime(tmp_path, ns=(0, 1))  # Guard against a coarse mtime clock
+        assert list_libraries(tmp_path) == ["A", "B"]
+    
     def test_search_parts_returns_tuples(self):
         """search_parts returns (lib, symbol) tuples."""
         auto_discover_libs()
@@ -317,6 +426,73 @@ class TestSchematicGeneration:
     def setup_method(self):
         reset_circuit()
     
+    def test_fast_uuids_are_valid_v4(self):
+        """Batched UUIDs are unique, canonical version 4 UUIDs."""
+        from sform_skidl.io.schematic_io import _fast_uuids
+        
+        ids = _fast_uuids(500)
+        assert len(set(ids)) == 500
+        for s in ids:
+            u = uuid.UUID(s)
+            assert str(u) == s
+            assert u.version == 4 and u.variant == uuid.RFC_4122
+    
+    def test_writer_dedups_wires_and_junctions(self):
+        """Repeated wires (either direction) and junctions are kept once."""
+        from sform_skidl.io.schematic_io import SchematicWriter
+        
+        w = SchematicWriter()
+        w.add_wire((0, 0), (2.54, 0))
+        w.add_wire((2.54, 0), (0, 0))
+        w.add_wire((0.0, 0.0), (2.5400000000000001, 0.01))
+        w.add_wire((0, 0), (0, 2.54))
+        w.add_junction((1.27, 1.27))
+        w.add_junction((1.27000001, 1.27))
+        
+        sch = w.build()
+        assert sum(1 for item in sch if item[0] == "wire") == 2
+        assert sum(1 for item in sch if item[0] == "junction") == 1
+    
+    def test_lib_symbols_follow_symbol_edits(self):
+        """Embedded lib_symbols reflect the symbol as it is at build time."""
+        from sform_skidl.io.schematic_io import SchematicWriter
+        from sform_skidl.models.part import Part as PartClass
+        
+        sym = Symbol(name='BUF', pins=[Pin('1', 'A')])
+        w = SchematicWriter()
+        w.add_part(PartClass(lib='Logic', name='BUF', _symbol=sym))
+        first = w._build_lib_symbols()
+        
+        sym.pins.append(Pin('2', 'Y'))
+        sym.properties['Value'] = 'BUF2'
+        w = SchematicWriter()
+        w.add_part(PartClass(lib='Logic', name='BUF', _symbol=sym))
+        second = w._build_lib_symbols()
+        
+        pins_unit = second[1][-1]
+        assert [item[0] for item in pins_unit[2:]] == ['pin', 'pin']
+        values = [item[2] for item in second[1] if item[:2] == ['property', 'Value']]
+        assert values == ['BUF2']
+        assert first[1] is not second[1]
+    
+    def test_writer_text_items_match_serialized_lists(self):
+        """Pre-formatted wires, junctions and labels match serialize()."""
+        from sform_skidl.io.schematic_io import SchematicWriter, WireSegment
+        from sform_skidl.sexpr import serialize
+        
+        w = SchematicWriter()
+        cases = [
+            (w._build_wire, w._wire_text, (WireSegment((1, -2.5), (3.125, 40.0000001)),)),
+            (w._build_junction, w._junction_text, ((0.0, 12.7),)),
+            (w._build_label, w._label_text, ('clk_out', (1.5, -2), 90)),
+            (w._build_label, w._label_text, ('Net "A" 1', (0, 0), 0)),
+        ]
+        for build, text, args in cases:
+            w._uuid_pool = ["0" * 8 + "-0000-4000-8000-" + "0" * 12]
+            expected = serialize(["kicad_sch", build(*args)])
+            w._uuid_pool = ["0" * 8 + "-0000-4000-8000-" + "0" * 12]
+            assert f"(kicad_sch\n{text(*args)}\n)" == expected
+    
     def test_generate_schematic_creates_file(self, tmp_path):
         """generate_schematic creates valid file."""
         r = Part('Device', 'R')
@@ -332,3 +508,276 @@ class TestSchematicGeneration:
         content = output.read_text()
         assert 'kicad_sch' in content
         assert 'symbol' in content
+    
+    def test_generate_flat_schematic_single_file(self, tmp_path):
+        """A circuit without subcircuits is written as one sheet."""
+        vin, gnd = Net('VIN'), Net('GND')
+        vin & Part('Device', 'R', value='1K') & Net('MID') & Part('Device', 'R', value='2K') & gnd
+        
+        output = tmp_path / "flat.kicad_sch"
+        generate_schematic(str(output))
+        
+        assert [f.name for f in tmp_path.iterdir()] == ["flat.kicad_sch"]
+        content = output.read_text()
+        assert '"1K"' in content and '"2K"' in content
+        assert "(sheet " not in content
+    
+    def test_generate_hierarchical_schematic_with_ports(self, tmp_path):
+        """Subcircuit nets shared with the root become sheet ports."""
+        from sform_skidl import subcircuit
+        
+        @subcircuit
+        def divider(vin, vout, gnd):
+            vin & Part('Device', 'R', value='1K') & vout & Part('Device', 'R', value='2K') & gnd
+        
+        vcc, mid, gnd = Net('VCC'), Net('MID'), Net('GND')
+        divider(vcc, mid, gnd)
+        mid & Part('Device', 'R', value='5K') & gnd
+        
+        output = tmp_path / "top.kicad_sch"
+        generate_schematic(str(output))
+        
+        assert output.exists()
+        assert (tmp_path / "top_divider_1.kicad_sch").exists()
+    
+    @staticmethod
+    def _sheet_contents(path):
+        """Symbols, wires and labels of a sheet, without UUIDs, as sorted lists."""
+        from sform_skidl import parse_file
+        
+        def freeze(expr):
+            if not isinstance(expr, list):
+                return expr
+            if expr[:1] == ['path']:
+                expr = expr[:1] + expr[2:]  # Instance path: the sheet's UUID
+            return tuple(freeze(e) for e in expr if not (isinstance(e, list) and e[:1] == ['uuid']))
+        
+        items = parse_file(path)[0][1:]
+        return {
+            kind: sorted(freeze(item) for item in items if isinstance(item, list) and item[0] == kind)
+            for kind in ('symbol', 'wire', 'global_label')
+        }
+    
+    def _divider_circuit(self, gnd_name='GND'):
+        from sform_skidl import subcircuit
+        
+        @subcircuit
+        def divider(vin, vout, gnd):
+            vin & Part('Device', 'R', value='1K') & vout & Part('Device', 'R', value='2K') & gnd
+        
+        vcc, mid, gnd = Net('VCC'), Net('MID'), Net(gnd_name)
+        divider(vcc, mid, gnd)
+        mid & Part('Device', 'R', value='5K') & gnd
+    
+    def test_generate_hierarchical_schematic_in_workers(self, tmp_path):
+        """Sheets written by worker processes match the serial output."""
+        self._divider_circuit()
+        
+        generate_schematic(str(tmp_path / "serial.kicad_sch"))
+        generate_schematic(str(tmp_path / "pool.kicad_sch"), workers=2)
+        
+        for suffix in ("", "_divider_1"):
+            serial = self._sheet_contents(tmp_path / f"serial{suffix}.kicad_sch")
+            pooled = self._sheet_contents(tmp_path / f"pool{suffix}.kicad_sch")
+            assert pooled == serial
+        assert serial['symbol'] and serial['wire'] and serial['global_label']
+    
+    def test_unpicklable_sheets_are_written_in_process(self, tmp_path):
+        """Sheets that can't be sent to a worker are written by the caller."""
+        import pickle
+        
+        class Unpicklable(str):
+            def __reduce_ex__(self, protocol):
+                raise pickle.PicklingError("not for workers")
+        
+        self._divider_circuit(gnd_name=Unpicklable('GND'))
+        generate_schematic(str(tmp_path / "serial.kicad_sch"))
+        generate_schematic(str(tmp_path / "pool.kicad_sch"), workers=2)
+        
+        for suffix in ("", "_divider_1"):
+            serial = self._sheet_contents(tmp_path / f"serial{suffix}.kicad_sch")
+            assert self._sheet_contents(tmp_path / f"pool{suffix}.kicad_sch") == serial
+
+
+class TestPartsDatabase:
+    """Tests for parts database lookup."""
+    
+    def setup_method(self):
+        reset_circuit()
+    
+    def test_find_keeps_database_order_with_wildcards(self):
+        """Value-indexed lookup still returns the first matching spec."""
+        from sform_skidl import PartsDatabase
+        
+        db = PartsDatabase()
+        db.add('R', '', '0603', lcsc='C_ANY')
+        db.add('R', '10K', '0603', lcsc='C_10K')
+        db.add('R', '10K', '0402', lcsc='C_10K_0402')
+        
+        r1 = Part('Device', 'R', value='10K', footprint='R_0402')
+        r2 = Part('Device', 'R', value='10K', footprint='R_0603')
+        
+        assert db.find(r1).vendors['lcsc'] == 'C_10K_0402'
+        assert db.find(r2).vendors['lcsc'] == 'C_ANY'
+    
+    def test_find_lcsc(self):
+        """Specs can be looked up directly by LCSC part number."""
+        from sform_skidl import load_bundled_parts
+        
+        db = load_bundled_parts(['resistors'])
+        spec = db.find_lcsc('C25804')
+        assert spec is not None
+        assert spec.value == '10K'
+        assert db.find_lcsc('C0') is None
+    
+    def test_apply_to_circuit_resolves_repeated_parts(self):
+        """Identical parts all receive vendor fields."""
+        from sform_skidl import PartsDatabase
+        
+        db = PartsDatabase()
+        db.add('C', '100nF', '0402', lcsc='C1525')
+        
+        caps = [Part('Device', 'C', value='100nF', footprint='C_0402') for _ in range(3)]
+        matched, unmatched = db.apply_to_circuit(verbose=False)
+        
+        assert matched == 3
+        assert not unmatched
+        assert all(c.fields['lcsc'] == 'C1525' for c in caps)
+
+
+class TestSymbolResolution:
+    """Tests for cached library symbol lookup in the Part factory."""
+    
+    def setup_method(self):
+        reset_circuit()
+    
+    def test_fallback_symbol_shared_between_parts(self):
+        """Parts built from the same fallback symbol share it but not pins."""
+        r1 = Part('NoSuchLib', 'R')
+        r2 = Part('NoSuchLib', 'R')
+        assert r1._symbol is r2._symbol
+        assert r1[1] is not r2[1]
+    
+    def test_shared_symbol_pins_connect_independently(self):
+        """Pins copied from one shared symbol can all join the same net."""
+        r1 = Part('NoSuchLib', 'R')
+        r2 = Part('NoSuchLib', 'R')
+        n = Net('SHARED')
+        n += r1[1], r2[1]
+        assert len(n.pins) == 2
+    
+    def test_pin_instances_keep_per_part_state(self):
+        """Aliases and connections on one part's pin don't leak to the symbol."""
+        r1 = Part('NoSuchLib', 'R')
+        r2 = Part('NoSuchLib', 'R')
+        r1[1].add_alias('TOP')
+        r1[1].connect(Net('A'))
+        
+        assert r2[1].aliases == []
+        assert r2[1].net is None
+        assert r1._symbol.pins[0]._part is None
+        assert r1[1].position == r1._symbol.pins[0].position
+
+
+class TestBulkAdd:
+    """Tests for batched part creation."""
+    
+    def setup_method(self):
+        reset_circuit()
+    
+    def test_bulk_add_defers_circuit_append(self):
+        """Parts join the circuit when the block exits, with unique refs."""
+        from sform_skidl import bulk_add
+        
+        with bulk_add():
+            parts = [Part('Device', 'R') for _ in range(5)]
+            assert get_circuit().parts == []
+        
+        assert get_circuit().parts == parts
+        assert len({p.ref for p in parts}) == 5
+
+
+class TestTransform:
+    """Tests for symbol placement transforms."""
+    
+    def test_transform_points_matches_single_points(self):
+        """Batch transform gives the same points as one-at-a-time."""
+        from sform_skidl.geometry import Point, Transform
+        
+        pts = [(1.0, 0.0), Point(0.0, 2.54), (-3.81, 1.27)]
+        for rotation in (0, 90, 180, 270, 45):
+            t = Transform(10.0, 20.0, rotation)
+            assert t.transform_points(pts) == [t.transform_point(p) for p in pts]
+        
+        assert Transform(0, 0, 90).transform_points([(10, 0)]) == [Point(0, -10)]
+    
+    def test_points_are_hashable(self):
+        """Coincident points collapse in a set."""
+        from sform_skidl.geometry import Point, Transform
+        
+        t = Transform(5.0, 5.0, 180)
+        assert len({Point(5.0, 5.0), t.transform_point((0, 0)), Point(1, 2)}) == 2
+
+
+class TestSubcircuitPrefix:
+    """Tests for subcircuit hierarchy naming."""
+    
+    def setup_method(self):
+        reset_circuit()
+    
+    def test_nested_subcircuits_set_part_hierarchy(self):
+        """Parts record the enclosing subcircuit path, restored on exit."""
+        from sform_skidl.hierarchy import SubCircuitContext, get_hierarchy_prefix
+        
+        with SubCircuitContext("top"):
+            with SubCircuitContext("inner"):
+                assert get_hierarchy_prefix() == "top.inner."
+                inner = Part('Device', 'R')
+            outer = Part('Device', 'R')
+        
+        assert get_hierarchy_prefix() == ""
+        assert inner.hierarchy == "top.inner"
+        assert outer.hierarchy == "top"
+
+
+class TestRouter:
+    """Tests for the Manhattan wire router."""
+    
+    def test_route_avoids_obstacle(self):
+        """Routed path joins the snapped endpoints with grid steps around a part."""
+        from sform_skidl.routing import Point, Router
+        
+        router = Router()
+        router.add_obstacle(12.7, 0, 5.08, 5.08)
+        path = router.route((0, 0), (25.4, 0))
+        
+        assert path[0] == (0, 0) and path[-1] == (router._snap(25.4), 0)
+        for (x0, y0), (x1, y1) in zip(path, path[1:]):
+            assert abs(abs(x1 - x0) + abs(y1 - y0) - router.grid_size) < 1e-9
+        assert not any(obs.contains(Point(x, y)) for obs in router.obstacles for x, y in path)
+    
+    def test_obstacle_added_after_route_is_seen(self):
+        """Obstacles added between route() calls invalidate the cached grid."""
+        from sform_skidl.routing import Point, Router
+        
+        router = Router()
+        assert router.route((0, 0), (25.4, 0))[1] == (1.27, 0)
+        
+        router.add_obstacle(12.7, 0, 5.08, 5.08)
+        path = router.route((0, 0), (25.4, 0))
+        assert not any(obs.contains(Point(x, y)) for obs in router.obstacles for x, y in path)
+    
+    def test_obstacles_edited_in_place_are_seen(self):
+        """Replacing or moving obstacles directly invalidates the cached grid."""
+        from sform_skidl.routing import Point, Rect, Router
+        
+        router = Router()
+        router.add_obstacle(12.7, 20, 5.08, 5.08)
+        assert router.route((0, 0), (25.4, 0))[1] == (1.27, 0)
+        
+        router.obstacles[0] = Rect(10, -3, 15, 3)
+        path = router.route((0, 0), (25.4, 0))
+        assert not any(obs.contains(Point(x, y)) for obs in router.obstacles for x, y in path)
+        
+        router.obstacles = [Rect(10, -20, 15, -15)]
+        assert all(y == 0 for _, y in router.route((0, 0), (25.4, 0)))
@@ -61,6 +61,9 @@ class TestBus:
         # Pins should now be on b1 nets (moved from b2)
         assert len(b1[0].pins) == 1
         assert len(b2[0].pins) == 0  # Pin was moved
+        assert p.pins[0].net is b1[0]
+        assert sum(b1[0]._type_counts.values()) == 1
+        assert sum(b2[0]._type_counts.values()) == 0
     
     def test_bus_width_mismatch_raises(self):
         """Bus += with mismatched widths raises ValueError."""
@@ -115,6 +118,27 @@ class TestRegexPinLookup:
         assert isinstance(pins, PinGroup)
         assert len(pins) == 2
     
+    def test_invalid_pattern_falls_back_to_exact_name(self):
+        """A key that is not a valid regex is looked up as a pin name."""
+        p = Part('Device', 'R')
+        p.set_pin_count(2)
+        p.add_pin(Pin('3', 'CLK('))
+        
+        assert p['CLK('] is p['3']
+        assert p['CLK('] is p['3']  # again, via the memoized compile
+    
+    def test_prefix_pattern_matches_name_or_number(self):
+        """Part['D.*'] matches pin names and numbers by prefix."""
+        p = Part('Device', 'R')
+        p.set_pin_count(2)
+        p.add_pin(Pin('3', 'D0'))
+        p.add_pin(Pin('D4', 'X'))
+        p.add_pin(Pin('5', 'AD1'))
+        
+        assert p['D.*'].pins == [p['3'], p['D4']]
+        with pytest.raises(KeyError, match="No pins matching"):
+            p['Q.*']
+    
     def test_space_separated_pin_access(self):
         """Part['1 2 3'] returns multiple pins as PinGroup."""
         p = Part('Device', 'R')
@@ -160,6 +160,61 @@ class TestERCScenarios:
         # Should not have warning for pin 2
         error_locations = [e.location for e in errors]
         assert not any('R1.2' in str(loc) for loc in error_locations)
+    
+    def test_no_connect_function(self):
+        """no_connect() marks single pins and pin groups."""
+        from sform_skidl import no_connect
+        
+        r = Part('Device', 'R')
+        r.set_pin_count(4)
+        
+        no_connect(r[1], r['3 4'])
+        
+        assert [p._no_connect for p in r.pins] == [True, False, True, True]
+    
+    def test_erc_output_conflict_and_power_short(self):
+        """Test net-level checks report conflicts and keep check order."""
+        from sform_skidl import Symbol, Pin, PinType
+        from sform_skidl.api import Circuit
+        from sform_skidl.models.part import Part as PartClass
+        
+        def buf():
+            sym = Symbol(name='BUF', pins=[
+                Pin('1', 'Y', PinType.OUTPUT),
+                Pin('2', 'VCC', PinType.POWER_IN),
+                Pin('3', 'GND', PinType.POWER_IN),
+            ])
+            return PartClass(lib='Logic', name='BUF', _symbol=sym)
+        
+        u1, u2 = buf(), buf()
+        
+        out, rail = Net('OUT'), Net('RAIL')
+        out += u1[1], u2[1]
+        rail += u1['VCC'], u1['GND']
+        
+        circuit = Circuit()
+        circuit.parts = [u1, u2]
+        circuit.nets = [rail, out]
+        
+        errors = ERC(circuit=circuit, verbose=False)
+        net_errors = [e for e in errors if e.location in ('OUT', 'RAIL')]
+        
+        assert [e.location for e in net_errors] == ['OUT', 'RAIL']
+        assert 'Multiple outputs' in net_errors[0].message
+        assert 'power-to-ground' in net_errors[1].message
+    
+    def test_erc_sees_pin_type_changed_after_connecting(self):
+        """Test retyping connected pins is reflected in the net checks."""
+        from sform_skidl import PinType
+        
+        r1, r2 = Part('Device', 'R'), Part('Device', 'R')
+        x = Net('X')
+        x += r1[1], r2[1]
+        r1[1].pin_type = PinType.OUTPUT
+        r2[1].pin_type = PinType.OUTPUT
+        
+        messages = [e.message for e in ERC(verbose=False) if e.location == 'X']
+        assert messages == [f'Multiple outputs connected: {r1.ref}.1, {r2.ref}.1']
 
 
 class TestBOMIntegration:
@@ -214,6 +269,52 @@ class TestBOMIntegration:
             # Should have 2 line items (10K x2, 1K x1)
             assert len(rows) == 2
 
+    def test_bom_quotes_special_fields(self):
+        """Fields with commas, quotes or newlines read back unchanged."""
+        import csv
+        from sform_skidl import generate_bom
+        
+        for value in ('10K', '1/4" 10K', '10K,1%'):
+            Part('Device', 'R', value=value, footprint='0603').set_pin_count(2)
+        Part('Device', 'R', value='10K', footprint='0603').set_pin_count(2)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "bom.csv"
+            generate_bom(str(path), format='generic')
+            
+            with open(path, newline='') as f:
+                rows = list(csv.reader(f))
+        
+        by_value = {row[1]: row for row in rows[1:]}
+        assert set(by_value) == {'10K', '1/4" 10K', '10K,1%'}
+        assert ',' in by_value['10K'][0]  # Grouped designators stay one field
+        assert by_value['10K'][3] == '2'
+    
+    def test_bom_item_designator_str(self):
+        """Sorted designator string follows list changes."""
+        from sform_skidl.bom import BOMItem
+        
+        item = BOMItem(designators=['R2', 'R1'])
+        assert item.designator_str == 'R1,R2'
+        
+        item.designators.append('R0')
+        assert item.designator_str == 'R0,R1,R2'
+    
+    def test_reduce_bom_tolerances(self):
+        """Parts differing only in tolerance consolidate to the tightest."""
+        from sform_skidl import reduce_bom
+        
+        r1 = Part('Device', 'R', value='10K', footprint='0603')
+        r2 = Part('Device', 'R', value='10K', footprint='0603')
+        r3 = Part('Device', 'R', value='10K', footprint='0603')
+        r1.fields['tolerance'] = '1%'
+        r3.fields['tolerance'] = 'odd'  # Unknown counts as 5%
+        
+        result = reduce_bom(verbose=False, apply=True)
+        
+        assert list(result.values()) == [[r1.ref, r2.ref, r3.ref]]
+        assert all(r.fields['tolerance'] == '1%' for r in (r1, r2, r3))
+    
     def test_mpn_export(self):
         """Test MPN exporter outputs correct field."""
         import csv
@@ -242,6 +343,26 @@ class TestMultipleVendors:
     def setup_method(self):
         reset_circuit()
     
+    def test_get_exporter_shared_until_register(self):
+        """Exporter instances are reused until a new exporter is registered."""
+        from sform_skidl.bom import (
+            GenericExporter, _exporters, get_exporter, register_exporter,
+        )
+        
+        first = get_exporter('generic')
+        assert get_exporter('generic') is first
+        
+        class OtherExporter(GenericExporter):
+            name = 'other_test'
+        
+        register_exporter(OtherExporter)
+        try:
+            assert isinstance(get_exporter('other_test'), OtherExporter)
+            assert get_exporter('generic') is not first
+        finally:
+            _exporters.pop('other_test')
+            get_exporter.cache_clear()
+    
     def test_all_exporters_work(self):
         """Test all registered exporters can generate output."""
         from sform_skidl import generate_bom, list_exporters
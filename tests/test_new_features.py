@@ -7,7 +7,7 @@ import tempfile
 from pathlib import Path
 
 from sform_skidl import (
-    Part, Net, reset_circuit,
+    Part, Net, Pin, reset_circuit,
     Network, tee, star,
     generate_spice,
 )
@@ -156,3 +156,11 @@ class TestPinAliases:
         pin.add_alias('VCC')  # Duplicate
         
         assert pin.aliases.count('VCC') == 1
+    
+    def test_add_alias_keeps_order_within_call(self):
+        """Repeats within one call are dropped and order is kept."""
+        pin = Pin('1', 'A')
+        pin.add_alias('B', 'C', 'B', 'A2')
+        pin.add_alias('C', 'D')
+        
+        assert pin.aliases == ['B', 'C', 'A2', 'D']
@@ -68,6 +68,22 @@ class TestParser:
         assert result[0][0] == "symbol"
         assert result[0][1] == "R"
         assert result[0][2][0] == "property"
+    
+    def test_parse_errors(self):
+        """Unbalanced parens and unterminated strings raise ParseError."""
+        from sform_skidl.sexpr.parser import ParseError
+        
+        for text in ("(foo (bar)", "(foo))", '(foo "bar)'):
+            with pytest.raises(ParseError):
+                parse(text)
+    
+    def test_parse_deep_nesting(self):
+        """Nesting depth is not limited by the recursion limit."""
+        depth = 5000
+        result = parse("(a " * depth + ")" * depth)
+        for _ in range(depth - 1):
+            result = result[0][1:]
+        assert result == [["a"]]
 
 
 class TestWriter:
@@ -110,6 +126,50 @@ class TestWriter:
         """Quotes in strings are escaped."""
         result = serialize(["text", 'Say "Hello"'])
         assert result == r'(text "Say \"Hello\"")'
+    
+    def test_serialize_deep_nesting(self):
+        """Deeply nested block lists are written without recursion."""
+        data = leaf = ["a"]
+        for _ in range(4999):
+            leaf.append(["a"])
+            leaf = leaf[1]
+        
+        lines = serialize(data).splitlines()
+        assert len(lines) == 2 * 4999 + 1
+        assert lines[4999].strip() == "(a)"
+    
+    def test_serialize_block_to_file_matches_serialize(self, tmp_path):
+        """Streaming a block from a generator writes the same text."""
+        from sform_skidl.sexpr import serialize_block_to_file, serialize_to_file
+        
+        items = [
+            ["version", 20250114],
+            ["symbol", "R1", ["property", "Value", "10K"], ["pin", "1"]],
+            ["wire", ["pts", ["xy", 1.5, 2]]],
+        ]
+        serialize_block_to_file("kicad_sch", (item for item in items), tmp_path / "a")
+        serialize_to_file(["kicad_sch", *items], tmp_path / "b")
+        
+        expected = serialize(["kicad_sch", *items]) + "\n"
+        assert (tmp_path / "a").read_text() == expected
+        assert (tmp_path / "b").read_text() == expected
+    
+    def test_serialize_block_to_file_keeps_target_on_error(self, tmp_path):
+        """A failing generator leaves the existing file and no temp file."""
+        from sform_skidl.sexpr import serialize_block_to_file
+        
+        target = tmp_path / "out.kicad_sch"
+        target.write_text("(kicad_sch)\n")
+        
+        def items():
+            yield ["version", 20250114]
+            raise RuntimeError("boom")
+        
+        with pytest.raises(RuntimeError, match="boom"):
+            serialize_block_to_file("kicad_sch", items(), target)
+        
+        assert target.read_text() == "(kicad_sch)\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.kicad_sch"]
 
 
 class TestRoundTrip: